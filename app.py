@@ -1,9 +1,14 @@
 from flask import Flask, render_template, send_from_directory
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
-from pymongo import MongoClient
 import os
+import click
 from config import Config
+from backend.utils.db import get_client, get_db
+from backend.utils.indexes import ensure_indexes, print_index_report
+from backend.utils.json_provider import FastJSONProvider
+from backend.utils.metrics import init_metrics
+from backend.utils.profiling import init_profiling, make_profile_token
 
 # Initialize Flask app
 app = Flask(__name__, 
@@ -13,20 +18,56 @@ app = Flask(__name__,
 # Load configuration
 app.config.from_object(Config)
 
+# Fast JSON encoding for API responses
+app.json = FastJSONProvider(app)
+
 # Setup CORS
 CORS(app)
 
+# Per-endpoint request and MongoDB command metrics on /metrics
+if app.config['METRICS_ENABLED']:
+    init_metrics(app)
+
+# Opt-in profiling of single requests sent with a signed X-Profile-Token
+if app.config['PROFILING_ENABLED'] and app.config['PROFILING_SECRET']:
+    init_profiling(app)
+
 # Setup JWT
 jwt = JWTManager(app)
 
 # Connect to MongoDB
 try:
-    mongo_client = MongoClient(app.config['MONGO_URI'])
+    mongo_client = get_client(app.config)
     db = mongo_client.get_database()
     print("Connected to MongoDB successfully!")
+    if app.config['MONGO_ENSURE_INDEXES']:
+        ensure_indexes(db)
 except Exception as e:
     print(f"Failed to connect to MongoDB: {e}")
 
+# Index management commands
+@app.cli.command('ensure-indexes')
+def ensure_indexes_command():
+    created = ensure_indexes(get_db(app.config))
+    for collection_name, names in created.items():
+        print(f"{collection_name}: {', '.join(names) or 'no indexes created'}")
+
+@app.cli.command('index-report')
+def index_report_command():
+    print_index_report(get_db(app.config))
+
+@app.cli.command('profile-token')
+@click.option('--ttl', default=300, help='Seconds the token stays valid.')
+def profile_token_command(ttl):
+    if not app.config['PROFILING_SECRET']:
+        raise click.ClickException("PROFILING_SECRET is not set")
+    print(f"X-Profile-Token: {make_profile_token(app.config['PROFILING_SECRET'], ttl)}")
+
+@app.cli.command('process-images')
+def process_images_command():
+    from backend.controllers.product_controller import backfill_renditions
+    print(f"Processed images for {backfill_renditions(app)} products")
+
 # Ensure upload directory exists
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
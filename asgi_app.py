@@ -0,0 +1,91 @@
+from quart import Quart, render_template, request
+from config import Config
+from app import app as wsgi_app
+from backend.aio.utils.db import open_client, close_client
+from backend.aio.utils.metrics import init_metrics
+from backend.utils.json_provider import FastJSONProvider
+
+# Async application mode: the same API served on an event loop with the
+# async MongoDB driver. Run with an ASGI server, e.g.
+#   hypercorn asgi_app:app --workers 4
+# Importing the WSGI app reuses its startup (index creation, upload folder)
+# and lets upload endpoints run its controllers on worker threads.
+
+# Initialize Quart app
+app = Quart(__name__,
+            static_folder='frontend/static',
+            template_folder='frontend/templates')
+
+# Load configuration
+app.config.from_object(Config)
+
+# Fast JSON encoding for API responses
+app.json = FastJSONProvider(app)
+
+app.extensions['sync_app'] = wsgi_app
+
+# Open the async MongoDB client on the serving event loop
+@app.before_serving
+async def connect_mongo():
+    open_client(app.config)
+
+@app.after_serving
+async def disconnect_mongo():
+    await close_client()
+
+# Per-endpoint request and MongoDB command metrics on /metrics
+if app.config['METRICS_ENABLED']:
+    init_metrics(app)
+
+# Allow cross-origin API calls, as flask-cors does for the WSGI app
+@app.after_request
+async def add_cors_headers(response):
+    response.headers['Access-Control-Allow-Origin'] = '*'
+    if request.method == 'OPTIONS':
+        response.headers['Access-Control-Allow-Methods'] = 'GET, HEAD, POST, PUT, PATCH, DELETE, OPTIONS'
+        requested_headers = request.headers.get('Access-Control-Request-Headers')
+        if requested_headers:
+            response.headers['Access-Control-Allow-Headers'] = requested_headers
+    return response
+
+# Import routes
+from backend.aio.routes.auth_routes import auth_bp
+from backend.aio.routes.product_routes import product_bp
+from backend.aio.routes.cart_routes import cart_bp
+from backend.aio.routes.user_routes import user_bp
+
+# Register blueprints
+app.register_blueprint(auth_bp, url_prefix='/api/auth')
+app.register_blueprint(product_bp, url_prefix='/api/products')
+app.register_blueprint(cart_bp, url_prefix='/api/cart')
+app.register_blueprint(user_bp, url_prefix='/api/users')
+
+# Frontend routes
+PAGES = {
+    '/': 'index.html',
+    '/login': 'login.html',
+    '/signup': 'signup.html',
+    '/products': 'products.html',
+    '/add-product': 'add-product.html',
+    '/my-listings': 'my-listings.html',
+    '/cart': 'cart.html',
+    '/profile': 'profile.html',
+    '/purchases': 'purchases.html'
+}
+
+async def page():
+    return await render_template(PAGES[request.url_rule.rule])
+
+for rule in PAGES:
+    app.add_url_rule(rule, f"page:{rule}", page)
+
+@app.route('/product/<product_id>')
+async def product_detail(product_id):
+    return await render_template('product-detail.html', product_id=product_id)
+
+@app.route('/<path:path>')
+async def catch_all(path):
+    return await render_template('index.html')
+
+if __name__ == '__main__':
+    app.run(debug=True)
\ No newline at end of file
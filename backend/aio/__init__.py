@@ -0,0 +1 @@
+# Async application package initialization
\ No newline at end of file
@@ -0,0 +1 @@
+# Async controllers package initialization
\ No newline at end of file
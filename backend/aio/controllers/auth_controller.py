@@ -0,0 +1,83 @@
+from quart import current_app
+from pymongo.errors import DuplicateKeyError
+from backend.models.user_model import User
+from backend.utils.serializers import serialize_user
+from backend.utils.password_utils import get_password_hasher, PasswordHasherBusy
+from backend.aio.utils.db import get_db
+from backend.aio.utils.auth_utils import create_access_token
+
+# Mirrors backend.controllers.auth_controller. bcrypt runs on the shared
+# hashing pool and is awaited, so the event loop keeps serving meanwhile.
+
+async def register_user(email, password, username=None):
+    users_collection = get_db().users
+    
+    # Check if user already exists
+    existing_user = await users_collection.find_one({"email": email})
+    if existing_user:
+        return {"error": "Email already registered"}, 400
+    
+    # Create new user with hashed password
+    try:
+        hashed_password = await get_password_hasher(current_app.config).hash_async(password)
+    except PasswordHasherBusy as e:
+        return {"error": str(e)}, 503
+    new_user = User(email=email, password=hashed_password, username=username)
+    
+    # Insert user into database; the unique email index catches a concurrent
+    # registration that passed the check above while this one was hashing
+    try:
+        await users_collection.insert_one({
+            "_id": new_user._id,
+            "email": new_user.email,
+            "password": new_user.password,
+            "username": new_user.username,
+            "created_at": new_user.created_at
+        })
+    except DuplicateKeyError:
+        return {"error": "Email already registered"}, 400
+    
+    # Create access token
+    access_token = create_access_token(identity=str(new_user._id))
+    
+    return {
+        "message": "User registered successfully",
+        "user": new_user.to_dict(),
+        "access_token": access_token
+    }, 201
+
+async def login_user(email, password):
+    users_collection = get_db().users
+    
+    # Find user by email
+    user_data = await users_collection.find_one({"email": email})
+    if not user_data:
+        return {"error": "Invalid email or password"}, 401
+    
+    # Check password
+    hasher = get_password_hasher(current_app.config)
+    try:
+        matches, needs_rehash = await hasher.verify_async(user_data["password"], password)
+    except PasswordHasherBusy as e:
+        return {"error": str(e)}, 503
+    if not matches:
+        return {"error": "Invalid email or password"}, 401
+    
+    # Upgrade hashes created with an older work factor
+    if needs_rehash:
+        try:
+            await users_collection.update_one(
+                {"_id": user_data["_id"], "password": user_data["password"]},
+                {"$set": {"password": await hasher.hash_async(password)}}
+            )
+        except PasswordHasherBusy:
+            pass
+    
+    # Create access token
+    access_token = create_access_token(identity=str(user_data["_id"]))
+    
+    return {
+        "message": "Login successful",
+        "user": serialize_user(user_data),
+        "access_token": access_token
+    }, 200
\ No newline at end of file
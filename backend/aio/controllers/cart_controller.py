@@ -0,0 +1,165 @@
+from datetime import datetime
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from backend.models.cart_model import CartItem
+from backend.controllers.cart_controller import CART_PRODUCT_FIELDS, _parse_quantity
+from backend.utils.serializers import serialize_cart
+from backend.aio.utils.db import get_db
+
+# Mirrors backend.controllers.cart_controller with the same update operators
+
+async def _load_cart_products(products_collection, product_ids):
+    object_ids = [ObjectId(product_id) for product_id in product_ids if ObjectId.is_valid(product_id)]
+    if not object_ids:
+        return {}
+    
+    products_by_id = {}
+    async for product_data in products_collection.find({"_id": {"$in": object_ids}}, CART_PRODUCT_FIELDS):
+        product_id = str(product_data["_id"])
+        products_by_id[product_id] = {
+            "_id": product_id,
+            "title": product_data.get("title"),
+            "price": float(product_data.get("price") or 0),
+            "image_url": product_data.get("image_url") or "",
+            "thumbnail_url": product_data.get("images", {}).get("thumbnail"),
+            "category": product_data.get("category")
+        }
+    return products_by_id
+
+async def get_user_cart(user_id):
+    db = get_db()
+    carts_collection = db.carts
+    products_collection = db.products
+    
+    # Get cart
+    cart_data = await carts_collection.find_one({"user_id": ObjectId(user_id)})
+    
+    # If cart doesn't exist, create one (upsert so concurrent requests agree)
+    if not cart_data:
+        cart_data = await _upsert_empty_cart(carts_collection, user_id)
+        return {"cart": serialize_cart(cart_data), "cart_items": []}, 200
+    
+    items = cart_data.get("items", [])
+    
+    # Get product details for all items in one query
+    products_by_id = await _load_cart_products(products_collection, [item["product_id"] for item in items])
+    
+    # Items whose product was deleted or is invalid are left out
+    cart_items = []
+    for item in items:
+        product = products_by_id.get(str(item["product_id"]))
+        if product:
+            cart_item = {
+                "_id": str(item["_id"]),
+                "product": product,
+                "quantity": item["quantity"],
+                "added_at": item.get("added_at")
+            }
+            cart_items.append(cart_item)
+    
+    return {"cart": serialize_cart(cart_data), "cart_items": cart_items}, 200
+
+async def _upsert_empty_cart(carts_collection, user_id):
+    now = datetime.utcnow()
+    return await carts_collection.find_one_and_update(
+        {"user_id": ObjectId(user_id)},
+        {"$setOnInsert": {"items": [], "created_at": now, "updated_at": now}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+
+async def add_to_cart(user_id, product_id, quantity=1):
+    db = get_db()
+    carts_collection = db.carts
+    products_collection = db.products
+    
+    quantity = _parse_quantity(quantity)
+    if quantity is None:
+        return {"error": "Quantity must be a positive integer"}, 400
+    
+    # Check if product exists
+    if not ObjectId.is_valid(product_id) or not await products_collection.find_one({"_id": ObjectId(product_id)}, {"_id": 1}):
+        return {"error": "Product not found"}, 404
+    product_id = str(product_id)
+    
+    # The $ne upsert relies on the unique carts.user_id index (user_id_unique,
+    # created by ensure_indexes): without it concurrent first adds would
+    # create duplicate carts instead of raising DuplicateKeyError
+    for attempt in range(2):
+        # Increment the quantity if the product is already in the cart
+        cart_data = await carts_collection.find_one_and_update(
+            {"user_id": ObjectId(user_id), "items.product_id": product_id},
+            {"$inc": {"items.$.quantity": quantity}, "$set": {"updated_at": datetime.utcnow()}},
+            return_document=ReturnDocument.AFTER
+        )
+        if cart_data:
+            break
+        
+        # Otherwise append it, creating the cart on first add
+        now = datetime.utcnow()
+        try:
+            cart_data = await carts_collection.find_one_and_update(
+                {"user_id": ObjectId(user_id), "items.product_id": {"$ne": product_id}},
+                {
+                    "$push": {"items": CartItem(product_id, quantity, added_at=now).to_dict()},
+                    "$set": {"updated_at": now},
+                    "$setOnInsert": {"created_at": now}
+                },
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+            break
+        except DuplicateKeyError:
+            # A concurrent request added the same product first; increment instead
+            continue
+    
+    # Both attempts lost a race with concurrent writes to the same cart
+    if cart_data is None:
+        return {"error": "Cart is being updated concurrently, please retry"}, 409
+    
+    return {"message": "Item added to cart", "cart": serialize_cart(cart_data)}, 200
+
+async def remove_from_cart(user_id, product_id):
+    # Remove item from cart
+    cart_data = await get_db().carts.find_one_and_update(
+        {"user_id": ObjectId(user_id)},
+        {"$pull": {"items": {"product_id": str(product_id)}}, "$set": {"updated_at": datetime.utcnow()}},
+        return_document=ReturnDocument.AFTER
+    )
+    if not cart_data:
+        return {"error": "Cart not found"}, 404
+    
+    return {"message": "Item removed from cart", "cart": serialize_cart(cart_data)}, 200
+
+async def update_cart_item(user_id, product_id, quantity):
+    carts_collection = get_db().carts
+    
+    quantity = _parse_quantity(quantity)
+    if quantity is None:
+        return {"error": "Quantity must be a positive integer"}, 400
+    
+    # Update item quantity
+    cart_data = await carts_collection.find_one_and_update(
+        {"user_id": ObjectId(user_id), "items.product_id": str(product_id)},
+        {"$set": {"items.$.quantity": quantity, "updated_at": datetime.utcnow()}},
+        return_document=ReturnDocument.AFTER
+    )
+    if not cart_data:
+        if not await carts_collection.find_one({"user_id": ObjectId(user_id)}, {"_id": 1}):
+            return {"error": "Cart not found"}, 404
+        return {"error": "Item not found in cart"}, 404
+    
+    return {"message": "Cart updated", "cart": serialize_cart(cart_data)}, 200
+
+async def clear_cart(user_id):
+    # Clear cart
+    cart_data = await get_db().carts.find_one_and_update(
+        {"user_id": ObjectId(user_id)},
+        {"$set": {"items": [], "updated_at": datetime.utcnow()}},
+        return_document=ReturnDocument.AFTER
+    )
+    if not cart_data:
+        return {"error": "Cart not found"}, 404
+    
+    return {"message": "Cart cleared", "cart": serialize_cart(cart_data)}, 200
\ No newline at end of file
@@ -0,0 +1,135 @@
+from quart import current_app
+from bson import ObjectId
+from backend.controllers.product_controller import _listing_tag, _detail_tag, _detail_key
+from backend.utils.serializers import serialize_product
+from backend.utils.fieldsets import parse_fields, to_projection, InvalidFields, PRODUCT_FIELDS
+from backend.utils.pagination import text_search_pipeline, InvalidCursor
+from backend.utils.cache import get_cache
+from backend.aio.utils.db import get_db
+from backend.aio.utils.pagination import paginate, paginate_text_search
+from backend.aio.utils.streaming import iter_serialized
+
+# Read endpoints mirrored from backend.controllers.product_controller. Cache
+# keys and tags are the same, so writes made through either app invalidate
+# entries cached by the other.
+
+async def get_all_products(category=None, search_query=None, limit=None, cursor=None, fields=None):
+    try:
+        fields = parse_fields(fields, PRODUCT_FIELDS)
+    except InvalidFields as e:
+        return {"error": str(e)}, 400
+    
+    # Build query
+    query = {}
+    if category and category != "all":
+        query["category"] = category
+    else:
+        category = None
+    search_query = (search_query or "").strip()[:current_app.config['MAX_SEARCH_LENGTH']]
+    
+    # Serve from cache when this exact page was requested recently
+    cache = get_cache(current_app.config)
+    cache_key = f"products:list:{category or 'all'}:{search_query.lower()}:{limit}:{cursor}:{fields}"
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached, 200
+    
+    products_collection = get_db().products
+    
+    # Get one page of products, ranked by text relevance when searching
+    try:
+        if search_query:
+            products_data, next_cursor = await paginate_text_search(
+                products_collection, query, search_query, limit, cursor, to_projection(fields)
+            )
+        else:
+            products_data, next_cursor = await paginate(
+                products_collection, query, "created_at", limit, cursor, to_projection(fields)
+            )
+    except InvalidCursor as e:
+        return {"error": str(e)}, 400
+    products = [serialize_product(product, fields) for product in products_data]
+    
+    result = {"products": products, "next_cursor": next_cursor}
+    cache.set(cache_key, result, tags=[_listing_tag(category)])
+    return result, 200
+
+async def stream_products(category=None, search_query=None, fields=None):
+    try:
+        fields = parse_fields(fields, PRODUCT_FIELDS)
+    except InvalidFields as e:
+        return {"error": str(e)}, 400
+    
+    # Build query
+    query = {}
+    if category and category != "all":
+        query["category"] = category
+    search_query = (search_query or "").strip()[:current_app.config['MAX_SEARCH_LENGTH']]
+    
+    products_collection = get_db().products
+    batch_size = current_app.config['STREAM_BATCH_SIZE']
+    
+    # Every matching product, fetched from the server batch by batch
+    if search_query:
+        pipeline = text_search_pipeline(query, search_query, projection=to_projection(fields))
+        products_data = await products_collection.aggregate(pipeline, batchSize=batch_size)
+    else:
+        products_data = products_collection.find(query, to_projection(fields)) \
+            .sort([("created_at", -1), ("_id", -1)]).batch_size(batch_size)
+    
+    return iter_serialized(products_data, serialize_product, fields), 200
+
+async def get_product_by_id(product_id, fields=None):
+    try:
+        fields = parse_fields(fields, PRODUCT_FIELDS)
+    except InvalidFields as e:
+        return {"error": str(e)}, 400
+    
+    # Serve from cache when available
+    cache = get_cache(current_app.config)
+    cache_key = _detail_key(product_id, fields)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached, 200
+    
+    # Get product
+    try:
+        product_data = await get_db().products.find_one({"_id": ObjectId(product_id)}, to_projection(fields))
+        if not product_data:
+            return {"error": "Product not found"}, 404
+        
+        result = {"product": serialize_product(product_data, fields)}
+        cache.set(cache_key, result, tags=[_detail_tag(product_id)])
+        return result, 200
+    except Exception as e:
+        return {"error": str(e)}, 400
+
+async def get_user_products(user_id, limit=None, cursor=None, fields=None):
+    try:
+        fields = parse_fields(fields, PRODUCT_FIELDS)
+    except InvalidFields as e:
+        return {"error": str(e)}, 400
+    
+    # Get products
+    try:
+        products_data, next_cursor = await paginate(
+            get_db().products, {"seller_id": ObjectId(user_id)}, "created_at", limit, cursor,
+            to_projection(fields)
+        )
+        products = [serialize_product(product, fields) for product in products_data]
+        
+        return {"products": products, "next_cursor": next_cursor}, 200
+    except Exception as e:
+        return {"error": str(e)}, 400
+
+async def stream_user_products(user_id, fields=None):
+    try:
+        fields = parse_fields(fields, PRODUCT_FIELDS)
+    except InvalidFields as e:
+        return {"error": str(e)}, 400
+    
+    # Every listing of the seller, fetched from the server batch by batch
+    products_data = get_db().products.find({"seller_id": ObjectId(user_id)}, to_projection(fields)) \
+        .sort([("created_at", -1), ("_id", -1)]).batch_size(current_app.config['STREAM_BATCH_SIZE'])
+    
+    return iter_serialized(products_data, serialize_product, fields), 200
\ No newline at end of file
@@ -0,0 +1,185 @@
+from datetime import datetime
+from quart import current_app
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import PyMongoError, ExecutionTimeout
+from backend.models.purchase_model import Purchase, PurchaseItem
+from backend.controllers.user_controller import _summary_pipeline, _summary_result
+from backend.utils.serializers import serialize_user, serialize_purchase
+from backend.utils.fieldsets import parse_fields, to_projection, InvalidFields, PURCHASE_FIELDS
+from backend.aio.utils.db import get_client, get_db
+from backend.aio.utils.pagination import paginate
+from backend.aio.utils.streaming import iter_serialized
+
+# Mirrors backend.controllers.user_controller
+
+async def get_user_profile(user_id):
+    # Get user
+    try:
+        user_data = await get_db().users.find_one({"_id": ObjectId(user_id)})
+        if not user_data:
+            return {"error": "User not found"}, 404
+        
+        return {"user": serialize_user(user_data)}, 200
+    except Exception as e:
+        return {"error": str(e)}, 400
+
+async def update_user_profile(user_id, username=None, email=None):
+    users_collection = get_db().users
+    
+    # Get user
+    try:
+        user_data = await users_collection.find_one({"_id": ObjectId(user_id)})
+        if not user_data:
+            return {"error": "User not found"}, 404
+        
+        # Update fields
+        update_data = {}
+        if username:
+            update_data["username"] = username
+        if email:
+            # Check if email is already taken
+            existing_user = await users_collection.find_one({"email": email})
+            if existing_user and str(existing_user["_id"]) != user_id:
+                return {"error": "Email already taken"}, 400
+            update_data["email"] = email
+        
+        # Update user
+        await users_collection.update_one(
+            {"_id": ObjectId(user_id)},
+            {"$set": update_data}
+        )
+        
+        # Get updated user
+        updated_user_data = await users_collection.find_one({"_id": ObjectId(user_id)})
+        
+        return {"user": serialize_user(updated_user_data)}, 200
+    except Exception as e:
+        return {"error": str(e)}, 400
+
+async def get_user_purchases(user_id, limit=None, cursor=None, fields=None):
+    try:
+        fields = parse_fields(fields, PURCHASE_FIELDS)
+    except InvalidFields as e:
+        return {"error": str(e)}, 400
+    
+    # Get purchases
+    try:
+        purchases_data, next_cursor = await paginate(
+            get_db().purchases, {"user_id": ObjectId(user_id)}, "purchase_date", limit, cursor,
+            to_projection(fields)
+        )
+        purchases = [serialize_purchase(purchase, fields) for purchase in purchases_data]
+        
+        return {"purchases": purchases, "next_cursor": next_cursor}, 200
+    except Exception as e:
+        return {"error": str(e)}, 400
+
+async def stream_user_purchases(user_id, fields=None):
+    try:
+        fields = parse_fields(fields, PURCHASE_FIELDS)
+    except InvalidFields as e:
+        return {"error": str(e)}, 400
+    
+    # Every purchase of the user, fetched from the server batch by batch
+    purchases_data = get_db().purchases.find({"user_id": ObjectId(user_id)}, to_projection(fields)) \
+        .sort([("purchase_date", -1), ("_id", -1)]).batch_size(current_app.config['STREAM_BATCH_SIZE'])
+    
+    return iter_serialized(purchases_data, serialize_purchase, fields), 200
+
+async def get_purchase_summary(user_id):
+    config = current_app.config
+    
+    # Aggregate server-side, bounded by maxTimeMS
+    try:
+        pipeline = _summary_pipeline(user_id, config['PURCHASE_SUMMARY_MONTHS'], config['PURCHASE_SUMMARY_TOP_ITEMS'])
+        cursor = await get_db().purchases.aggregate(pipeline, maxTimeMS=config['PURCHASE_SUMMARY_MAX_TIME_MS'])
+        facets = (await cursor.to_list(1))[0]
+        return {"summary": _summary_result(facets)}, 200
+    except ExecutionTimeout:
+        return {"error": "Purchase summary took too long"}, 503
+    except Exception as e:
+        return {"error": str(e)}, 400
+
+async def _checkout(db, user_id, session=None):
+    carts_collection = db.carts
+    products_collection = db.products
+    purchases_collection = db.purchases
+    
+    # Read and empty the cart in one atomic step so concurrent checkouts
+    # of the same cart cannot both succeed
+    cart_data = await carts_collection.find_one_and_update(
+        {"user_id": ObjectId(user_id), "items.0": {"$exists": True}},
+        {"$set": {"items": [], "updated_at": datetime.utcnow()}},
+        return_document=ReturnDocument.BEFORE,
+        session=session
+    )
+    if not cart_data:
+        return None
+    
+    # Load title and price of every cart product in one query
+    product_ids = [ObjectId(item["product_id"]) for item in cart_data["items"] if ObjectId.is_valid(item.get("product_id"))]
+    products_by_id = {
+        str(product_data["_id"]): product_data
+        async for product_data in products_collection.find(
+            {"_id": {"$in": product_ids}}, {"title": 1, "price": 1}, session=session
+        )
+    }
+    
+    # Create purchase items, skipping products that no longer exist
+    purchase_items = []
+    total_amount = 0
+    for item in cart_data["items"]:
+        product_data = products_by_id.get(str(item.get("product_id")))
+        if product_data:
+            purchase_item = PurchaseItem(
+                product_id=item["product_id"],
+                title=product_data["title"],
+                price=product_data["price"],
+                quantity=item["quantity"]
+            )
+            purchase_items.append(purchase_item)
+            total_amount += purchase_item.price * purchase_item.quantity
+    
+    # Create purchase
+    purchase = Purchase(
+        user_id=ObjectId(user_id),
+        items=purchase_items,
+        total_amount=total_amount
+    )
+    
+    # Insert purchase into database
+    try:
+        await purchases_collection.insert_one({
+            "_id": purchase._id,
+            "user_id": purchase.user_id,
+            "items": [item.to_dict() for item in purchase.items],
+            "total_amount": purchase.total_amount,
+            "purchase_date": purchase.purchase_date
+        }, session=session)
+    except PyMongoError:
+        # Without a transaction, put the items back so the cart is not lost
+        if session is None:
+            await carts_collection.update_one(
+                {"_id": cart_data["_id"]},
+                {"$push": {"items": {"$each": cart_data["items"], "$position": 0}}}
+            )
+        raise
+    
+    return purchase
+
+async def create_purchase_from_cart(user_id):
+    db = get_db()
+    
+    # Run the checkout in a multi-document transaction when the deployment
+    # supports it (replica set or sharded cluster)
+    if current_app.config.get('MONGO_USE_TRANSACTIONS'):
+        async with get_client().start_session() as session:
+            purchase = await session.with_transaction(lambda s: _checkout(db, user_id, session=s))
+    else:
+        purchase = await _checkout(db, user_id)
+    
+    if purchase is None:
+        return {"error": "Cart is empty"}, 400
+    
+    return {"purchase": purchase.to_dict()}, 201
\ No newline at end of file
@@ -0,0 +1 @@
+# Async routes package initialization
\ No newline at end of file
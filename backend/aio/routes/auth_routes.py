@@ -0,0 +1,41 @@
+from quart import Blueprint, request, jsonify
+from backend.aio.controllers.auth_controller import register_user, login_user
+from backend.aio.utils.response_utils import limit_auth_requests
+
+auth_bp = Blueprint('auth', __name__)
+
+# Throttle by client address and target email before any work is done
+auth_bp.before_request(limit_auth_requests)
+
+@auth_bp.route('/register', methods=['POST'])
+async def register():
+    data = await request.get_json()
+    
+    # Validate input
+    if not data or not data.get('email') or not data.get('password'):
+        return jsonify({"error": "Email and password are required"}), 400
+    
+    # Register user
+    result, status_code = await register_user(
+        email=data.get('email'),
+        password=data.get('password'),
+        username=data.get('username')
+    )
+    
+    return jsonify(result), status_code
+
+@auth_bp.route('/login', methods=['POST'])
+async def login():
+    data = await request.get_json()
+    
+    # Validate input
+    if not data or not data.get('email') or not data.get('password'):
+        return jsonify({"error": "Email and password are required"}), 400
+    
+    # Login user
+    result, status_code = await login_user(
+        email=data.get('email'),
+        password=data.get('password')
+    )
+    
+    return jsonify(result), status_code
\ No newline at end of file
@@ -0,0 +1,121 @@
+from quart import Blueprint, request, jsonify
+from backend.aio.controllers.product_controller import (
+    get_all_products, get_product_by_id, get_user_products, stream_products, stream_user_products
+)
+from backend.controllers.product_controller import create_product, update_product, delete_product
+from backend.aio.utils.auth_utils import token_required
+from backend.aio.utils.response_utils import conditional_response, run_sync
+from backend.aio.utils.streaming import stream_response, export_response
+from backend.utils.streaming import STREAM_FORMATS, EXPORT_FORMATS
+from backend.utils.serializers import PRODUCT_EXPORT_COLUMNS
+
+product_bp = Blueprint('product', __name__)
+
+@product_bp.route('/', methods=['GET'])
+async def get_products():
+    category = request.args.get('category')
+    search_query = request.args.get('search')
+    limit = request.args.get('limit', type=int)
+    cursor = request.args.get('cursor')
+    fields = request.args.get('fields')
+    stream_format = request.args.get('stream')
+    
+    # Stream every match instead of one page (?stream=json|ndjson)
+    if stream_format:
+        if stream_format not in STREAM_FORMATS:
+            return jsonify({"error": "stream must be one of: json, ndjson"}), 400
+        result, status_code = await stream_products(category, search_query, fields)
+        if status_code != 200:
+            return jsonify(result), status_code
+        return stream_response(result, "products", stream_format)
+    
+    result, status_code = await get_all_products(category, search_query, limit, cursor, fields)
+    return await conditional_response(result, status_code)
+
+@product_bp.route('/<product_id>', methods=['GET'])
+async def get_product(product_id):
+    result, status_code = await get_product_by_id(product_id, request.args.get('fields'))
+    return await conditional_response(result, status_code)
+
+# Writes stream image uploads to disk and schedule renditions, so they reuse
+# the WSGI controllers on a worker thread instead of being mirrored
+
+@product_bp.route('/', methods=['POST'])
+@token_required
+async def add_product(current_user):
+    # Get form data
+    form = await request.form
+    files = await request.files
+    title = form.get('title')
+    description = form.get('description')
+    category = form.get('category')
+    price = form.get('price')
+    image = files.get('image')
+    
+    # Validate input
+    if not title or not description or not category or not price:
+        return jsonify({"error": "All fields are required"}), 400
+    
+    # Create product
+    result, status_code = await run_sync(
+        create_product,
+        title=title,
+        description=description,
+        category=category,
+        price=price,
+        image=image,
+        seller_id=current_user
+    )
+    
+    return jsonify(result), status_code
+
+@product_bp.route('/<product_id>', methods=['PUT'])
+@token_required
+async def edit_product(current_user, product_id):
+    # Get form data
+    form = await request.form
+    files = await request.files
+    
+    # Update product
+    result, status_code = await run_sync(
+        update_product,
+        product_id=product_id,
+        title=form.get('title'),
+        description=form.get('description'),
+        category=form.get('category'),
+        price=form.get('price'),
+        image=files.get('image')
+    )
+    
+    return jsonify(result), status_code
+
+@product_bp.route('/<product_id>', methods=['DELETE'])
+@token_required
+async def remove_product(current_user, product_id):
+    result, status_code = await run_sync(delete_product, product_id)
+    return jsonify(result), status_code
+
+@product_bp.route('/user', methods=['GET'])
+@token_required
+async def get_my_products(current_user):
+    limit = request.args.get('limit', type=int)
+    cursor = request.args.get('cursor')
+    fields = request.args.get('fields')
+    
+    result, status_code = await get_user_products(current_user, limit, cursor, fields)
+    return jsonify(result), status_code
+
+@product_bp.route('/user/export', methods=['GET'])
+@token_required
+async def export_my_products(current_user):
+    export_format = request.args.get('format', 'csv')
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({"error": "format must be one of: csv, ndjson"}), 400
+    
+    result, status_code = await stream_user_products(current_user)
+    if status_code != 200:
+        return jsonify(result), status_code
+    return export_response(
+        result, export_format, "listings", PRODUCT_EXPORT_COLUMNS,
+        compress=request.args.get('gzip', 'false').lower() == 'true'
+    )
\ No newline at end of file
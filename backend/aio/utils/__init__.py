@@ -0,0 +1 @@
+# Async utils package initialization
\ No newline at end of file
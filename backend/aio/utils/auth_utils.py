@@ -0,0 +1,44 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from functools import wraps
+import jwt
+from quart import request, jsonify, current_app
+
+# Tokens carry the same claims flask-jwt-extended issues and checks, so a
+# token from either application mode is accepted by the other
+
+def create_access_token(identity):
+    config = current_app.config
+    now = datetime.now(timezone.utc)
+    claims = {
+        "fresh": False,
+        "iat": now,
+        "jti": str(uuid.uuid4()),
+        "type": "access",
+        config.get('JWT_IDENTITY_CLAIM', 'sub'): identity,
+        "nbf": now
+    }
+    expires = config.get('JWT_ACCESS_TOKEN_EXPIRES', timedelta(minutes=15))
+    if expires:
+        claims["exp"] = now + expires
+    return jwt.encode(claims, config['JWT_SECRET_KEY'], algorithm=config.get('JWT_ALGORITHM', 'HS256'))
+
+def decode_access_token(token):
+    config = current_app.config
+    claims = jwt.decode(token, config['JWT_SECRET_KEY'], algorithms=[config.get('JWT_ALGORITHM', 'HS256')])
+    if claims.get("type") != "access":
+        raise jwt.InvalidTokenError("Only access tokens are allowed")
+    return claims[config.get('JWT_IDENTITY_CLAIM', 'sub')]
+
+def token_required(f):
+    @wraps(f)
+    async def decorated(*args, **kwargs):
+        scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+        try:
+            if scheme != 'Bearer' or not token:
+                raise jwt.InvalidTokenError("Missing bearer token")
+            current_user = decode_access_token(token)
+        except (jwt.InvalidTokenError, KeyError):
+            return jsonify({"error": "Authentication required"}), 401
+        return await f(current_user, *args, **kwargs)
+    return decorated
\ No newline at end of file
@@ -0,0 +1,28 @@
+from quart import current_app
+from pymongo import AsyncMongoClient
+from backend.utils.db import _client_options
+
+# One AsyncMongoClient per worker process. It is bound to the event loop it
+# first runs on, so it is opened when the app starts serving and closed when
+# it stops rather than created at import time.
+_client = None
+
+def open_client(config):
+    global _client
+    if _client is None:
+        _client = AsyncMongoClient(config['MONGO_URI'], **_client_options(config))
+    return _client
+
+def get_client():
+    if _client is None:
+        return open_client(current_app.config)
+    return _client
+
+def get_db():
+    return get_client().get_database()
+
+async def close_client():
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
\ No newline at end of file
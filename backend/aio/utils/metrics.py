@@ -0,0 +1,52 @@
+from quart import request, g, Response, abort
+from quart.wrappers.response import IterableBody
+from backend.utils.metrics import (
+    start_request, finish_request, end_request, render_metrics, current_request, resume_request
+)
+
+async def aiter_recorded(body, metrics, method, status):
+    # Quart sends the body after teardown, so the request is made current
+    # again while it streams and recorded when it ends
+    token = resume_request(metrics)
+    try:
+        async for part in body:
+            yield part
+    finally:
+        if hasattr(body, "aclose"):
+            await body.aclose()
+        finish_request(method, status, metrics)
+        if token is not None:
+            end_request(token)
+
+def init_metrics(app):
+    # Same histograms as the WSGI app; the driver listener is shared through
+    # backend.utils.db._client_options
+    @app.before_request
+    async def start_request_metrics():
+        g.metrics_token = start_request(request.endpoint)
+    
+    @app.after_request
+    async def record_request_metrics(response):
+        metrics = current_request()
+        if isinstance(response.response, IterableBody) and metrics is not None:
+            g.metrics_deferred = True
+            response.response.iter = aiter_recorded(response.response.iter, metrics, request.method, response.status_code)
+        else:
+            finish_request(request.method, response.status_code)
+        return response
+    
+    @app.teardown_request
+    async def end_request_metrics(exc):
+        token = g.pop("metrics_token", None)
+        if token is None:
+            return
+        if not g.pop("metrics_deferred", False):
+            finish_request(request.method, 500)
+        end_request(token)
+    
+    @app.route('/metrics')
+    async def metrics():
+        expected = app.config.get('METRICS_TOKEN')
+        if expected and request.headers.get('Authorization') != f"Bearer {expected}":
+            abort(401)
+        return Response(render_metrics(), mimetype="text/plain; version=0.0.4")
\ No newline at end of file
@@ -0,0 +1,23 @@
+from quart import current_app
+from pymongo import DESCENDING
+from backend.utils.pagination import clamp_limit, keyset_query, page_projection, split_page, text_search_pipeline
+
+# Async counterparts of backend.utils.pagination; cursors are interchangeable
+
+async def paginate(collection, query, sort_field, limit=None, cursor=None, projection=None):
+    limit = clamp_limit(limit, current_app.config)
+    
+    docs = await (
+        collection.find(keyset_query(query, sort_field, cursor), page_projection(projection, sort_field))
+        .sort([(sort_field, DESCENDING), ("_id", DESCENDING)])
+        .limit(limit + 1)
+        .to_list(None)
+    )
+    return split_page(docs, limit, sort_field)
+
+async def paginate_text_search(collection, query, search_query, limit=None, cursor=None, projection=None):
+    limit = clamp_limit(limit, current_app.config)
+    
+    pipeline = text_search_pipeline(query, search_query, cursor, limit + 1, projection)
+    docs = await (await collection.aggregate(pipeline)).to_list(None)
+    return split_page(docs, limit, "score")
\ No newline at end of file
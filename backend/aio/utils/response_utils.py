@@ -0,0 +1,46 @@
+import asyncio
+from quart import request, jsonify, current_app
+from backend.utils.rate_limit import check_auth_rate_limit
+
+async def conditional_response(result, status_code, private=False):
+    response = jsonify(result)
+    response.status_code = status_code
+    if status_code != 200:
+        return response
+    
+    # Same validators as the WSGI app: strong ETag and a bodyless 304 on match
+    await response.add_etag()
+    if private:
+        response.headers['Cache-Control'] = 'private, no-cache'
+        response.vary.add('Authorization')
+    else:
+        response.headers['Cache-Control'] = 'no-cache'
+    
+    etag, _ = response.get_etag()
+    if request.method in ('GET', 'HEAD') and request.if_none_match.contains(etag):
+        response.status_code = 304
+        response.set_data(b"")
+    return response
+
+async def limit_auth_requests():
+    # before_request hook sharing the WSGI app's token buckets
+    data = await request.get_json(silent=True)
+    retry_after = check_auth_rate_limit(current_app.config, request.remote_addr, data)
+    if retry_after is None:
+        return None
+    
+    response = jsonify({"error": "Too many requests, please try again later"})
+    response.status_code = 429
+    response.headers['Retry-After'] = str(retry_after)
+    return response
+
+async def run_sync(fn, *args, **kwargs):
+    # Run a WSGI-app controller on a worker thread inside that app's context,
+    # for endpoints whose work is file I/O rather than database round trips
+    sync_app = current_app.extensions['sync_app']
+    
+    def call():
+        with sync_app.app_context():
+            return fn(*args, **kwargs)
+    
+    return await asyncio.to_thread(call)
\ No newline at end of file
@@ -0,0 +1,82 @@
+import zlib
+from quart import Response, current_app
+from backend.utils.streaming import STREAM_FORMATS, csv_line_encoder, gzip_compressor, export_attachment
+
+async def iter_serialized(cursor, serialize, fields=None):
+    # Async counterpart of backend.utils.streaming.iter_serialized
+    try:
+        async for doc in cursor:
+            yield serialize(doc, fields)
+    finally:
+        await cursor.close()
+
+async def iter_flattened(items, flatten):
+    try:
+        async for item in items:
+            for row in flatten(item):
+                yield row
+    finally:
+        await items.aclose()
+
+async def _chunked(parts, chunk_size):
+    buffer = []
+    size = 0
+    async for part in parts:
+        buffer.append(part)
+        size += len(part)
+        if size >= chunk_size:
+            yield "".join(buffer).encode("utf-8")
+            buffer = []
+            size = 0
+    if buffer:
+        yield "".join(buffer).encode("utf-8")
+
+async def _json_array_parts(items, key, dumps):
+    yield '{"' + key + '":['
+    separator = ""
+    async for item in items:
+        yield separator + dumps(item, compact=True)
+        separator = ","
+    yield "]}"
+
+async def _ndjson_parts(items, dumps):
+    async for item in items:
+        yield dumps(item, compact=True) + "\n"
+
+def stream_response(items, key, stream_format):
+    # Same body formats as the WSGI app, produced from an async cursor
+    dumps = current_app.json.dumps
+    if stream_format == "ndjson":
+        parts = _ndjson_parts(items, dumps)
+    else:
+        parts = _json_array_parts(items, key, dumps)
+    
+    chunks = _chunked(parts, current_app.config['STREAM_CHUNK_SIZE'])
+    return Response(chunks, mimetype=STREAM_FORMATS[stream_format])
+
+async def _csv_parts(rows, columns):
+    encode = csv_line_encoder(columns)
+    yield encode(dict(zip(columns, columns)))
+    async for row in rows:
+        yield encode(row)
+
+async def _gzipped(chunks):
+    compressor = gzip_compressor()
+    async for chunk in chunks:
+        yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+def export_response(rows, export_format, name, columns=None, compress=False):
+    # Same downloads as backend.utils.streaming.export_response
+    if export_format == "csv":
+        parts = _csv_parts(rows, columns)
+    else:
+        parts = _ndjson_parts(rows, current_app.json.dumps)
+    
+    chunks = _chunked(parts, current_app.config['STREAM_CHUNK_SIZE'])
+    if compress:
+        chunks = _gzipped(chunks)
+    mimetype, disposition = export_attachment(name, export_format, compress)
+    response = Response(chunks, mimetype=mimetype)
+    response.headers["Content-Disposition"] = disposition
+    return response
\ No newline at end of file
@@ -1,12 +1,14 @@
-from flask import current_app, jsonify
+from flask import jsonify
 from flask_jwt_extended import create_access_token
-from pymongo import MongoClient
+from pymongo.errors import DuplicateKeyError
 from backend.models.user_model import User
+from backend.utils.serializers import serialize_user
+from backend.utils.db import get_db
+from backend.utils.password_utils import get_password_hasher, PasswordHasherBusy
 
 def register_user(email, password, username=None):
-    # Connect to MongoDB
-    client = MongoClient(current_app.config['MONGO_URI'])
-    db = client.get_database()
+    # Get shared database handle
+    db = get_db()
     users_collection = db.users
     
     # Check if user already exists
@@ -15,17 +17,24 @@ def register_user(email, password, username=None):
         return {"error": "Email already registered"}, 400
     
     # Create new user with hashed password
-    hashed_password = User.hash_password(password)
+    try:
+        hashed_password = get_password_hasher().hash(password)
+    except PasswordHasherBusy as e:
+        return {"error": str(e)}, 503
     new_user = User(email=email, password=hashed_password, username=username)
     
-    # Insert user into database
-    result = users_collection.insert_one({
-        "_id": new_user._id,
-        "email": new_user.email,
-        "password": new_user.password,
-        "username": new_user.username,
-        "created_at": new_user.created_at
-    })
+    # Insert user into database; the unique email index catches a concurrent
+    # registration that passed the check above while this one was hashing
+    try:
+        result = users_collection.insert_one({
+            "_id": new_user._id,
+            "email": new_user.email,
+            "password": new_user.password,
+            "username": new_user.username,
+            "created_at": new_user.created_at
+        })
+    except DuplicateKeyError:
+        return {"error": "Email already registered"}, 400
     
     # Create access token
     access_token = create_access_token(identity=str(new_user._id))
@@ -37,9 +46,8 @@ def register_user(email, password, username=None):
     }, 201
 
 def login_user(email, password):
-    # Connect to MongoDB
-    client = MongoClient(current_app.config['MONGO_URI'])
-    db = client.get_database()
+    # Get shared database handle
+    db = get_db()
     users_collection = db.users
     
     # Find user by email
@@ -48,17 +56,29 @@ def login_user(email, password):
         return {"error": "Invalid email or password"}, 401
     
     # Check password
-    if not User.check_password(user_data["password"], password):
+    hasher = get_password_hasher()
+    try:
+        matches, needs_rehash = hasher.verify(user_data["password"], password)
+    except PasswordHasherBusy as e:
+        return {"error": str(e)}, 503
+    if not matches:
         return {"error": "Invalid email or password"}, 401
     
+    # Upgrade hashes created with an older work factor
+    if needs_rehash:
+        try:
+            users_collection.update_one(
+                {"_id": user_data["_id"], "password": user_data["password"]},
+                {"$set": {"password": hasher.hash(password)}}
+            )
+        except PasswordHasherBusy:
+            pass
+    
     # Create access token
     access_token = create_access_token(identity=str(user_data["_id"]))
     
-    # Create user object
-    user = User.from_dict(user_data)
-    
     return {
         "message": "Login successful",
-        "user": user.to_dict(),
+        "user": serialize_user(user_data),
         "access_token": access_token
     }, 200
\ No newline at end of file
@@ -1,177 +1,184 @@
-from flask import current_app
-from pymongo import MongoClient
+from datetime import datetime
 from bson import ObjectId
-from backend.models.cart_model import Cart, CartItem
-from backend.models.product_model import Product
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from backend.models.cart_model import CartItem
+from backend.utils.serializers import serialize_cart
+from backend.utils.db import get_db
+
+# Only the product fields the cart page shows
+CART_PRODUCT_FIELDS = {"title": 1, "price": 1, "image_url": 1, "images.thumbnail": 1, "category": 1}
+
+def _load_cart_products(products_collection, product_ids):
+    object_ids = [ObjectId(product_id) for product_id in product_ids if ObjectId.is_valid(product_id)]
+    if not object_ids:
+        return {}
+    
+    products_by_id = {}
+    for product_data in products_collection.find({"_id": {"$in": object_ids}}, CART_PRODUCT_FIELDS):
+        product_id = str(product_data["_id"])
+        products_by_id[product_id] = {
+            "_id": product_id,
+            "title": product_data.get("title"),
+            "price": float(product_data.get("price") or 0),
+            "image_url": product_data.get("image_url") or "",
+            "thumbnail_url": product_data.get("images", {}).get("thumbnail"),
+            "category": product_data.get("category")
+        }
+    return products_by_id
 
 def get_user_cart(user_id):
-    # Connect to MongoDB
-    client = MongoClient(current_app.config['MONGO_URI'])
-    db = client.get_database()
+    # Get shared database handle
+    db = get_db()
     carts_collection = db.carts
     products_collection = db.products
     
     # Get cart
     cart_data = carts_collection.find_one({"user_id": ObjectId(user_id)})
     
-    # If cart doesn't exist, create one
+    # If cart doesn't exist, create one (upsert so concurrent requests agree)
     if not cart_data:
-        cart = Cart(user_id=ObjectId(user_id))
-        carts_collection.insert_one({
-            "_id": cart._id,
-            "user_id": cart.user_id,
-            "items": [],
-            "created_at": cart.created_at,
-            "updated_at": cart.updated_at
-        })
-        return {"cart": cart.to_dict(), "cart_items": []}, 200
-    
-    # Create cart object
-    cart = Cart.from_dict(cart_data)
-    
-    # Get product details for each item in cart
+        cart_data = _upsert_empty_cart(carts_collection, user_id)
+        return {"cart": serialize_cart(cart_data), "cart_items": []}, 200
+    
+    items = cart_data.get("items", [])
+    
+    # Get product details for all items in one query
+    products_by_id = _load_cart_products(products_collection, [item["product_id"] for item in items])
+    
+    # Items whose product was deleted or is invalid are left out
     cart_items = []
-    for item in cart.items:
-        product_data = products_collection.find_one({"_id": ObjectId(item.product_id)})
-        if product_data:
-            product = Product.from_dict(product_data)
+    for item in items:
+        product = products_by_id.get(str(item["product_id"]))
+        if product:
             cart_item = {
-                "_id": str(item._id),
-                "product": product.to_dict(),
-                "quantity": item.quantity,
-                "added_at": item.added_at
+                "_id": str(item["_id"]),
+                "product": product,
+                "quantity": item["quantity"],
+                "added_at": item.get("added_at")
             }
             cart_items.append(cart_item)
     
-    return {"cart": cart.to_dict(), "cart_items": cart_items}, 200
+    return {"cart": serialize_cart(cart_data), "cart_items": cart_items}, 200
+
+def _upsert_empty_cart(carts_collection, user_id):
+    now = datetime.utcnow()
+    return carts_collection.find_one_and_update(
+        {"user_id": ObjectId(user_id)},
+        {"$setOnInsert": {"items": [], "created_at": now, "updated_at": now}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+
+def _parse_quantity(quantity):
+    try:
+        quantity = int(quantity)
+    except (TypeError, ValueError):
+        return None
+    return quantity if quantity > 0 else None
 
 def add_to_cart(user_id, product_id, quantity=1):
-    # Connect to MongoDB
-    client = MongoClient(current_app.config['MONGO_URI'])
-    db = client.get_database()
+    # Get shared database handle
+    db = get_db()
     carts_collection = db.carts
     products_collection = db.products
     
+    quantity = _parse_quantity(quantity)
+    if quantity is None:
+        return {"error": "Quantity must be a positive integer"}, 400
+    
     # Check if product exists
-    product_data = products_collection.find_one({"_id": ObjectId(product_id)})
-    if not product_data:
+    if not ObjectId.is_valid(product_id) or not products_collection.find_one({"_id": ObjectId(product_id)}, {"_id": 1}):
         return {"error": "Product not found"}, 404
-    
-    # Get cart
-    cart_data = carts_collection.find_one({"user_id": ObjectId(user_id)})
-    
-    # If cart doesn't exist, create one
-    if not cart_data:
-        cart = Cart(user_id=ObjectId(user_id))
-        cart.add_item(ObjectId(product_id), quantity)
-        
-        carts_collection.insert_one({
-            "_id": cart._id,
-            "user_id": cart.user_id,
-            "items": [item.to_dict() for item in cart.items],
-            "created_at": cart.created_at,
-            "updated_at": cart.updated_at
-        })
-    else:
-        # Create cart object
-        cart = Cart.from_dict(cart_data)
-        
-        # Add item to cart
-        cart.add_item(ObjectId(product_id), quantity)
-        
-        # Update cart in database
-        carts_collection.update_one(
-            {"_id": cart._id},
-            {"$set": {
-                "items": [item.to_dict() for item in cart.items],
-                "updated_at": cart.updated_at
-            }}
+    product_id = str(product_id)
+    
+    # The $ne upsert relies on the unique carts.user_id index (user_id_unique,
+    # created by ensure_indexes): without it concurrent first adds would
+    # create duplicate carts instead of raising DuplicateKeyError
+    for attempt in range(2):
+        # Increment the quantity if the product is already in the cart
+        cart_data = carts_collection.find_one_and_update(
+            {"user_id": ObjectId(user_id), "items.product_id": product_id},
+            {"$inc": {"items.$.quantity": quantity}, "$set": {"updated_at": datetime.utcnow()}},
+            return_document=ReturnDocument.AFTER
         )
-    
-    return {"message": "Item added to cart", "cart": cart.to_dict()}, 200
+        if cart_data:
+            break
+        
+        # Otherwise append it, creating the cart on first add
+        now = datetime.utcnow()
+        try:
+            cart_data = carts_collection.find_one_and_update(
+                {"user_id": ObjectId(user_id), "items.product_id": {"$ne": product_id}},
+                {
+                    "$push": {"items": CartItem(product_id, quantity, added_at=now).to_dict()},
+                    "$set": {"updated_at": now},
+                    "$setOnInsert": {"created_at": now}
+                },
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+            break
+        except DuplicateKeyError:
+            # A concurrent request added the same product first; increment instead
+            continue
+    
+    # Both attempts lost a race with concurrent writes to the same cart
+    if cart_data is None:
+        return {"error": "Cart is being updated concurrently, please retry"}, 409
+    
+    return {"message": "Item added to cart", "cart": serialize_cart(cart_data)}, 200
 
 def remove_from_cart(user_id, product_id):
-    # Connect to MongoDB
-    client = MongoClient(current_app.config['MONGO_URI'])
-    db = client.get_database()
+    # Get shared database handle
+    db = get_db()
     carts_collection = db.carts
     
-    # Get cart
-    cart_data = carts_collection.find_one({"user_id": ObjectId(user_id)})
-    if not cart_data:
-        return {"error": "Cart not found"}, 404
-    
-    # Create cart object
-    cart = Cart.from_dict(cart_data)
-    
     # Remove item from cart
-    cart.remove_item(product_id)
-    
-    # Update cart in database
-    carts_collection.update_one(
-        {"_id": cart._id},
-        {"$set": {
-            "items": [item.to_dict() for item in cart.items],
-            "updated_at": cart.updated_at
-        }}
+    cart_data = carts_collection.find_one_and_update(
+        {"user_id": ObjectId(user_id)},
+        {"$pull": {"items": {"product_id": str(product_id)}}, "$set": {"updated_at": datetime.utcnow()}},
+        return_document=ReturnDocument.AFTER
     )
+    if not cart_data:
+        return {"error": "Cart not found"}, 404
     
-    return {"message": "Item removed from cart", "cart": cart.to_dict()}, 200
+    return {"message": "Item removed from cart", "cart": serialize_cart(cart_data)}, 200
 
 def update_cart_item(user_id, product_id, quantity):
-    # Connect to MongoDB
-    client = MongoClient(current_app.config['MONGO_URI'])
-    db = client.get_database()
+    # Get shared database handle
+    db = get_db()
     carts_collection = db.carts
     
-    # Get cart
-    cart_data = carts_collection.find_one({"user_id": ObjectId(user_id)})
-    if not cart_data:
-        return {"error": "Cart not found"}, 404
-    
-    # Create cart object
-    cart = Cart.from_dict(cart_data)
+    quantity = _parse_quantity(quantity)
+    if quantity is None:
+        return {"error": "Quantity must be a positive integer"}, 400
     
     # Update item quantity
-    success = cart.update_quantity(product_id, quantity)
-    if not success:
-        return {"error": "Item not found in cart"}, 404
-    
-    # Update cart in database
-    carts_collection.update_one(
-        {"_id": cart._id},
-        {"$set": {
-            "items": [item.to_dict() for item in cart.items],
-            "updated_at": cart.updated_at
-        }}
+    cart_data = carts_collection.find_one_and_update(
+        {"user_id": ObjectId(user_id), "items.product_id": str(product_id)},
+        {"$set": {"items.$.quantity": quantity, "updated_at": datetime.utcnow()}},
+        return_document=ReturnDocument.AFTER
     )
+    if not cart_data:
+        if not carts_collection.find_one({"user_id": ObjectId(user_id)}, {"_id": 1}):
+            return {"error": "Cart not found"}, 404
+        return {"error": "Item not found in cart"}, 404
     
-    return {"message": "Cart updated", "cart": cart.to_dict()}, 200
+    return {"message": "Cart updated", "cart": serialize_cart(cart_data)}, 200
 
 def clear_cart(user_id):
-    # Connect to MongoDB
-    client = MongoClient(current_app.config['MONGO_URI'])
-    db = client.get_database()
+    # Get shared database handle
+    db = get_db()
     carts_collection = db.carts
     
-    # Get cart
-    cart_data = carts_collection.find_one({"user_id": ObjectId(user_id)})
-    if not cart_data:
-        return {"error": "Cart not found"}, 404
-    
-    # Create cart object
-    cart = Cart.from_dict(cart_data)
-    
     # Clear cart
-    cart.clear()
-    
-    # Update cart in database
-    carts_collection.update_one(
-        {"_id": cart._id},
-        {"$set": {
-            "items": [],
-            "updated_at": cart.updated_at
-        }}
+    cart_data = carts_collection.find_one_and_update(
+        {"user_id": ObjectId(user_id)},
+        {"$set": {"items": [], "updated_at": datetime.utcnow()}},
+        return_document=ReturnDocument.AFTER
     )
+    if not cart_data:
+        return {"error": "Cart not found"}, 404
     
-    return {"message": "Cart cleared", "cart": cart.to_dict()}, 200
\ No newline at end of file
+    return {"message": "Cart cleared", "cart": serialize_cart(cart_data)}, 200
\ No newline at end of file
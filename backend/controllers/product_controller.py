@@ -1,64 +1,150 @@
 from flask import current_app
-from pymongo import MongoClient
 from bson import ObjectId
 from backend.models.product_model import Product
+from backend.utils.serializers import serialize_product
+from backend.utils.fieldsets import parse_fields, to_projection, InvalidFields, PRODUCT_FIELDS
+from backend.utils.db import get_db
+from backend.utils.pagination import paginate, paginate_text_search, text_search_pipeline, InvalidCursor
+from backend.utils.streaming import iter_serialized
+from backend.utils.cache import get_cache
+from backend.utils.image_utils import create_renditions, submit_image_job
+from backend.utils.storage import get_file_store, acquire_upload, release_upload, UploadTooLarge
+from backend.utils.product_import import iter_import_rows, validate_import_row, ImportRowError, ImportStreamError
+from pymongo.errors import BulkWriteError
+from datetime import datetime
+import logging
 import os
-import uuid
-from werkzeug.utils import secure_filename
 
-def get_all_products(category=None, search_query=None):
-    # Connect to MongoDB
-    client = MongoClient(current_app.config['MONGO_URI'])
-    db = client.get_database()
+# Image worker failures have no request to report to, so they go to logging
+logger = logging.getLogger(__name__)
+
+def _listing_tag(category):
+    return f"products:category:{category or 'all'}"
+
+def _detail_tag(product_id):
+    return f"products:detail:{product_id}"
+
+def _detail_key(product_id, fields=None):
+    return f"products:detail:{product_id}:{fields}"
+
+def _invalidate_product_cache(product_id=None, categories=()):
+    # A product change affects its detail entry, the unfiltered listing and
+    # the listings of the categories it belonged to before and after
+    cache = get_cache()
+    tags = [_listing_tag(None)] + [_listing_tag(category) for category in categories if category]
+    if product_id:
+        tags.append(_detail_tag(product_id))
+    cache.invalidate_tags(tags)
+
+def get_all_products(category=None, search_query=None, limit=None, cursor=None, fields=None):
+    try:
+        fields = parse_fields(fields, PRODUCT_FIELDS)
+    except InvalidFields as e:
+        return {"error": str(e)}, 400
+    
+    # Build query
+    query = {}
+    if category and category != "all":
+        query["category"] = category
+    else:
+        category = None
+    search_query = (search_query or "").strip()[:current_app.config['MAX_SEARCH_LENGTH']]
+    
+    # Serve from cache when this exact page was requested recently
+    cache = get_cache()
+    cache_key = f"products:list:{category or 'all'}:{search_query.lower()}:{limit}:{cursor}:{fields}"
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached, 200
+    
+    # Get shared database handle
+    db = get_db()
     products_collection = db.products
     
+    # Get one page of products, ranked by text relevance when searching
+    try:
+        if search_query:
+            products_data, next_cursor = paginate_text_search(
+                products_collection, query, search_query, limit, cursor, to_projection(fields)
+            )
+        else:
+            products_data, next_cursor = paginate(
+                products_collection, query, "created_at", limit, cursor, to_projection(fields)
+            )
+    except InvalidCursor as e:
+        return {"error": str(e)}, 400
+    products = [serialize_product(product, fields) for product in products_data]
+    
+    result = {"products": products, "next_cursor": next_cursor}
+    cache.set(cache_key, result, tags=[_listing_tag(category)])
+    return result, 200
+
+def stream_products(category=None, search_query=None, fields=None):
+    try:
+        fields = parse_fields(fields, PRODUCT_FIELDS)
+    except InvalidFields as e:
+        return {"error": str(e)}, 400
+    
     # Build query
     query = {}
     if category and category != "all":
         query["category"] = category
-    if search_query:
-        query["$or"] = [
-            {"title": {"$regex": search_query, "$options": "i"}},
-            {"description": {"$regex": search_query, "$options": "i"}}
-        ]
+    search_query = (search_query or "").strip()[:current_app.config['MAX_SEARCH_LENGTH']]
     
-    # Get products
-    products_data = products_collection.find(query).sort("created_at", -1)
-    products = [Product.from_dict(product).to_dict() for product in products_data]
+    # Get shared database handle
+    db = get_db()
+    products_collection = db.products
+    batch_size = current_app.config['STREAM_BATCH_SIZE']
+    
+    # Every matching product, fetched from the server batch by batch
+    if search_query:
+        pipeline = text_search_pipeline(query, search_query, projection=to_projection(fields))
+        products_data = products_collection.aggregate(pipeline, batchSize=batch_size)
+    else:
+        products_data = products_collection.find(query, to_projection(fields)) \
+            .sort([("created_at", -1), ("_id", -1)]).batch_size(batch_size)
     
-    return {"products": products}, 200
+    return iter_serialized(products_data, serialize_product, fields), 200
 
-def get_product_by_id(product_id):
-    # Connect to MongoDB
-    client = MongoClient(current_app.config['MONGO_URI'])
-    db = client.get_database()
+def get_product_by_id(product_id, fields=None):
+    try:
+        fields = parse_fields(fields, PRODUCT_FIELDS)
+    except InvalidFields as e:
+        return {"error": str(e)}, 400
+    
+    # Serve from cache when available
+    cache = get_cache()
+    cache_key = _detail_key(product_id, fields)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached, 200
+    
+    # Get shared database handle
+    db = get_db()
     products_collection = db.products
     
     # Get product
     try:
-        product_data = products_collection.find_one({"_id": ObjectId(product_id)})
+        product_data = products_collection.find_one({"_id": ObjectId(product_id)}, to_projection(fields))
         if not product_data:
             return {"error": "Product not found"}, 404
         
-        product = Product.from_dict(product_data)
-        return {"product": product.to_dict()}, 200
+        result = {"product": serialize_product(product_data, fields)}
+        cache.set(cache_key, result, tags=[_detail_tag(product_id)])
+        return result, 200
     except Exception as e:
         return {"error": str(e)}, 400
 
 def create_product(title, description, category, price, image=None, seller_id=None):
-    # Connect to MongoDB
-    client = MongoClient(current_app.config['MONGO_URI'])
-    db = client.get_database()
+    # Get shared database handle
+    db = get_db()
     products_collection = db.products
     
     # Handle image upload
-    image_url = ""
-    if image and image.filename:
-        if allowed_file(image.filename, current_app.config['ALLOWED_EXTENSIONS']):
-            filename = secure_filename(f"{uuid.uuid4()}_{image.filename}")
-            image_path = os.path.join(current_app.config['UPLOAD_FOLDER'], filename)
-            image.save(image_path)
-            image_url = f"/static/uploads/{filename}"
+    try:
+        upload = _save_upload(image)
+    except UploadTooLarge as e:
+        return {"error": str(e)}, 413
     
     # Create product
     product = Product(
@@ -66,30 +152,120 @@ def create_product(title, description, category, price, image=None, seller_id=No
         description=description,
         category=category,
         price=price,
-        image_url=image_url,
+        image_url=upload["image_url"] if upload else "",
+        images=upload["images"] if upload else None,
         seller_id=ObjectId(seller_id) if seller_id else None
     )
     
     # Insert product into database
-    result = products_collection.insert_one({
+    try:
+        products_collection.insert_one(_product_document(product, upload["hash"] if upload else None))
+    except Exception:
+        if upload:
+            release_upload(db, get_file_store(), upload["hash"])
+        raise
+    _invalidate_product_cache(categories=[product.category])
+    if upload and not upload["images"]:
+        _schedule_renditions(upload["hash"])
+    
+    return {"product": product.to_dict()}, 201
+
+def _product_document(product, image_hash=None):
+    return {
         "_id": product._id,
         "title": product.title,
         "description": product.description,
         "category": product.category,
         "price": product.price,
         "image_url": product.image_url,
+        "images": product.images,
+        "image_hash": image_hash,
         "seller_id": product.seller_id,
         "created_at": product.created_at,
         "updated_at": product.updated_at,
         "slug": product.slug
-    })
+    }
+
+def import_products(stream, import_format, seller_id, ordered=False, batch_size=None):
+    config = current_app.config
+    if not batch_size or batch_size <= 0:
+        batch_size = config['IMPORT_BATCH_SIZE']
+    batch_size = min(batch_size, config['IMPORT_MAX_BATCH_SIZE'])
     
-    return {"product": product.to_dict()}, 201
+    # Get shared database handle
+    db = get_db()
+    products_collection = db.products
+    
+    report = {"inserted": 0, "failed": 0, "errors": [], "stopped_at_line": None}
+    status_code = 200
+    categories = set()
+    batch = []  # (line, document)
+    
+    def record_error(line, message):
+        report["failed"] += 1
+        if len(report["errors"]) < config['IMPORT_MAX_ERRORS']:
+            report["errors"].append({"line": line, "error": message})
+    
+    def flush():
+        # Returns False when an ordered import must stop
+        if not batch:
+            return True
+        try:
+            result = products_collection.insert_many([document for _, document in batch], ordered=ordered)
+            report["inserted"] += len(result.inserted_ids)
+        except BulkWriteError as e:
+            report["inserted"] += e.details.get("nInserted", 0)
+            for write_error in e.details.get("writeErrors", ()):
+                record_error(batch[write_error["index"]][0], write_error.get("errmsg", "Write failed"))
+            if ordered:
+                report["stopped_at_line"] = batch[e.details["writeErrors"][0]["index"]][0]
+                return False
+        finally:
+            batch.clear()
+        return True
+    
+    # Rows are validated as they stream in and written in batches
+    rows = 0
+    try:
+        for line, row, error in iter_import_rows(stream, import_format, config['IMPORT_MAX_BYTES']):
+            rows += 1
+            if rows > config['IMPORT_MAX_ROWS']:
+                record_error(line, f"Imports are limited to {config['IMPORT_MAX_ROWS']} rows")
+                report["stopped_at_line"] = line
+                break
+            
+            try:
+                if error:
+                    raise ImportRowError(error)
+                fields = validate_import_row(row)
+            except ImportRowError as e:
+                record_error(line, str(e))
+                if ordered:
+                    report["stopped_at_line"] = line
+                    break
+                continue
+            
+            product = Product(seller_id=ObjectId(seller_id), **fields)
+            batch.append((line, _product_document(product)))
+            categories.add(product.category)
+            if len(batch) >= batch_size and not flush():
+                break
+    except ImportStreamError as e:
+        record_error(e.line, str(e))
+        report["stopped_at_line"] = e.line
+        status_code = e.status_code
+    
+    # Valid rows read before any stop are still written
+    flush()
+    
+    if report["inserted"]:
+        _invalidate_product_cache(categories=categories)
+    report["errors_truncated"] = report["failed"] > len(report["errors"])
+    return report, status_code
 
 def update_product(product_id, title=None, description=None, category=None, price=None, image=None):
-    # Connect to MongoDB
-    client = MongoClient(current_app.config['MONGO_URI'])
-    db = client.get_database()
+    # Get shared database handle
+    db = get_db()
     products_collection = db.products
     
     # Get existing product
@@ -102,7 +278,7 @@ def update_product(product_id, title=None, description=None, category=None, pric
         update_data = {}
         if title:
             update_data["title"] = title
-            update_data["slug"] = Product.from_dict({"title": title}).slug
+            update_data["slug"] = Product.make_slug(title)
         if description:
             update_data["description"] = description
         if category:
@@ -110,59 +286,221 @@ def update_product(product_id, title=None, description=None, category=None, pric
         if price:
             update_data["price"] = float(price)
         
-        # Handle image upload
-        if image and image.filename:
-            if allowed_file(image.filename, current_app.config['ALLOWED_EXTENSIONS']):
-                filename = secure_filename(f"{uuid.uuid4()}_{image.filename}")
-                image_path = os.path.join(current_app.config['UPLOAD_FOLDER'], filename)
-                image.save(image_path)
-                update_data["image_url"] = f"/static/uploads/{filename}"
-        
-        # Update product
-        products_collection.update_one(
-            {"_id": ObjectId(product_id)},
-            {"$set": update_data}
-        )
+        # Handle image upload; renditions are generated in the background
+        upload = _save_upload(image)
+        if upload:
+            update_data["image_url"] = upload["image_url"]
+            update_data["images"] = upload["images"]
+            update_data["image_hash"] = upload["hash"]
+        
+        # Update product; a new image's reference is dropped if it is not used
+        try:
+            result = products_collection.update_one(
+                {"_id": ObjectId(product_id)},
+                {"$set": update_data}
+            )
+        except Exception:
+            if upload:
+                release_upload(db, get_file_store(), upload["hash"])
+            raise
+        if not result.matched_count:
+            if upload:
+                release_upload(db, get_file_store(), upload["hash"])
+            return {"error": "Product not found"}, 404
+        
+        _invalidate_product_cache(product_id, [product_data.get("category"), update_data.get("category")])
+        if upload:
+            if not upload["images"]:
+                _schedule_renditions(upload["hash"])
+            if product_data.get("image_hash"):
+                release_upload(db, get_file_store(), product_data["image_hash"])
         
         # Get updated product
         updated_product_data = products_collection.find_one({"_id": ObjectId(product_id)})
-        updated_product = Product.from_dict(updated_product_data)
         
-        return {"product": updated_product.to_dict()}, 200
+        return {"product": serialize_product(updated_product_data)}, 200
+    except UploadTooLarge as e:
+        return {"error": str(e)}, 413
     except Exception as e:
         return {"error": str(e)}, 400
 
 def delete_product(product_id):
-    # Connect to MongoDB
-    client = MongoClient(current_app.config['MONGO_URI'])
-    db = client.get_database()
+    # Get shared database handle
+    db = get_db()
     products_collection = db.products
     
     # Delete product
     try:
-        result = products_collection.delete_one({"_id": ObjectId(product_id)})
-        if result.deleted_count == 0:
+        product_data = products_collection.find_one_and_delete(
+            {"_id": ObjectId(product_id)}, {"category": 1, "image_hash": 1}
+        )
+        if not product_data:
             return {"error": "Product not found"}, 404
+        _invalidate_product_cache(product_id, [product_data.get("category")])
+        
+        # Reclaim the image files once no product references them
+        if product_data.get("image_hash"):
+            release_upload(db, get_file_store(), product_data["image_hash"])
         
         return {"message": "Product deleted successfully"}, 200
     except Exception as e:
         return {"error": str(e)}, 400
 
-def get_user_products(user_id):
-    # Connect to MongoDB
-    client = MongoClient(current_app.config['MONGO_URI'])
-    db = client.get_database()
+def get_user_products(user_id, limit=None, cursor=None, fields=None):
+    try:
+        fields = parse_fields(fields, PRODUCT_FIELDS)
+    except InvalidFields as e:
+        return {"error": str(e)}, 400
+    
+    # Get shared database handle
+    db = get_db()
     products_collection = db.products
     
     # Get products
     try:
-        products_data = products_collection.find({"seller_id": ObjectId(user_id)}).sort("created_at", -1)
-        products = [Product.from_dict(product).to_dict() for product in products_data]
+        products_data, next_cursor = paginate(
+            products_collection, {"seller_id": ObjectId(user_id)}, "created_at", limit, cursor,
+            to_projection(fields)
+        )
+        products = [serialize_product(product, fields) for product in products_data]
         
-        return {"products": products}, 200
+        return {"products": products, "next_cursor": next_cursor}, 200
     except Exception as e:
         return {"error": str(e)}, 400
 
+def stream_user_products(user_id, fields=None):
+    try:
+        fields = parse_fields(fields, PRODUCT_FIELDS)
+    except InvalidFields as e:
+        return {"error": str(e)}, 400
+    
+    # Get shared database handle
+    db = get_db()
+    products_collection = db.products
+    
+    # Every listing of the seller, fetched from the server batch by batch
+    products_data = products_collection.find({"seller_id": ObjectId(user_id)}, to_projection(fields)) \
+        .sort([("created_at", -1), ("_id", -1)]).batch_size(current_app.config['STREAM_BATCH_SIZE'])
+    
+    return iter_serialized(products_data, serialize_product, fields), 200
+
+def _save_upload(image):
+    if not image or not image.filename:
+        return None
+    if not allowed_file(image.filename, current_app.config['ALLOWED_EXTENSIONS']):
+        return None
+    
+    extension = image.filename.rsplit('.', 1)[1].lower()
+    return _store_image(current_app.config, image.stream, extension)
+
+def _store_image(config, stream, extension):
+    store = get_file_store()
+    digest, filename, tmp_path = store.write_stream(stream, extension)
+    try:
+        record = acquire_upload(get_db(), digest, filename)
+    except BaseException:
+        store.discard(tmp_path)
+        raise
+    images = {name: store.url(rendition) for name, rendition in record.get("renditions", {}).items()}
+    
+    # Identical bytes were uploaded before: reuse that file and its renditions
+    if filename != record["filename"] or (images and not config['IMAGE_KEEP_ORIGINAL']):
+        store.discard(tmp_path)
+    else:
+        store.keep(tmp_path, filename)
+    
+    return {
+        "hash": digest,
+        "image_url": images.get("detail") or store.url(record["filename"]),
+        "images": images
+    }
+
+def _schedule_renditions(digest):
+    app = current_app._get_current_object()
+    future = submit_image_job(app.config, _process_renditions, app, digest)
+    # The pool swallows exceptions nobody collects; log them instead
+    future.add_done_callback(_log_job_failure)
+
+def _log_job_failure(future):
+    if not future.cancelled() and future.exception() is not None:
+        logger.error("Image job failed", exc_info=future.exception())
+
+def _process_renditions(app, digest):
+    # Runs on an image worker thread, outside the request
+    with app.app_context():
+        config = app.config
+        db = get_db()
+        store = get_file_store()
+        
+        record = db.uploads.find_one({"_id": digest})
+        if not record:
+            return
+        
+        renditions = record.get("renditions")
+        if not renditions:
+            try:
+                renditions = create_renditions(
+                    store.path(record["filename"]), store.root, digest,
+                    image_format=config['IMAGE_FORMAT'], quality=config['IMAGE_QUALITY']
+                )
+            except Exception as e:
+                # Recorded on the upload so failed renditions can be found and retried
+                logger.exception("Failed to create renditions for %s", record["filename"])
+                db.uploads.update_one(
+                    {"_id": digest},
+                    {"$set": {"rendition_error": str(e), "rendition_failed_at": datetime.utcnow()}}
+                )
+                return
+            # The last reference may have been released while we worked
+            update = {"$set": {"renditions": renditions}, "$unset": {"rendition_error": "", "rendition_failed_at": ""}}
+            if not db.uploads.update_one({"_id": digest}, update).matched_count:
+                store.delete(list(renditions.values()))
+                return
+        
+        images = {name: store.url(rendition) for name, rendition in renditions.items()}
+        
+        # Attach the renditions to every product still using this upload
+        pending = {"image_hash": digest, "images.detail": {"$exists": False}}
+        products_data = list(db.products.find(pending, {"category": 1}))
+        db.products.update_many(pending, {"$set": {"images": images, "image_url": images["detail"]}})
+        for product_data in products_data:
+            _invalidate_product_cache(str(product_data["_id"]), [product_data.get("category")])
+        
+        # The original still carries its metadata, so it is not kept
+        if not config['IMAGE_KEEP_ORIGINAL']:
+            store.delete([record["filename"]])
+
+def backfill_renditions(app):
+    # Move products uploaded before the content-addressed store into it and
+    # generate their renditions
+    products_collection = get_db(app.config).products
+    products_data = products_collection.find(
+        {"image_url": {"$regex": "^/static/uploads/"}, "image_hash": None},
+        {"image_url": 1}
+    )
+    count = 0
+    for product_data in products_data:
+        legacy_path = os.path.join(app.config['UPLOAD_FOLDER'], product_data["image_url"].rsplit("/", 1)[-1])
+        if not os.path.exists(legacy_path):
+            continue
+        
+        with app.app_context():
+            with open(legacy_path, "rb") as stream:
+                upload = _store_image(app.config, stream, legacy_path.rsplit('.', 1)[-1].lower())
+            try:
+                products_collection.update_one(
+                    {"_id": product_data["_id"]},
+                    {"$set": {"image_hash": upload["hash"], "image_url": upload["image_url"], "images": upload["images"]}}
+                )
+            except Exception:
+                release_upload(get_db(), get_file_store(), upload["hash"])
+                raise
+            if not upload["images"]:
+                _process_renditions(app, upload["hash"])
+        os.remove(legacy_path)
+        count += 1
+    return count
+
 def allowed_file(filename, allowed_extensions):
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in allowed_extensions
\ No newline at end of file
@@ -1,14 +1,18 @@
+from datetime import datetime
 from flask import current_app
-from pymongo import MongoClient
 from bson import ObjectId
-from backend.models.user_model import User
+from pymongo import ReturnDocument
+from pymongo.errors import PyMongoError, ExecutionTimeout
 from backend.models.purchase_model import Purchase, PurchaseItem
-from backend.models.cart_model import Cart
+from backend.utils.serializers import serialize_user, serialize_purchase
+from backend.utils.fieldsets import parse_fields, to_projection, InvalidFields, PURCHASE_FIELDS
+from backend.utils.db import get_client, get_db
+from backend.utils.pagination import paginate
+from backend.utils.streaming import iter_serialized
 
 def get_user_profile(user_id):
-    # Connect to MongoDB
-    client = MongoClient(current_app.config['MONGO_URI'])
-    db = client.get_database()
+    # Get shared database handle
+    db = get_db()
     users_collection = db.users
     
     # Get user
@@ -17,15 +21,13 @@ def get_user_profile(user_id):
         if not user_data:
             return {"error": "User not found"}, 404
         
-        user = User.from_dict(user_data)
-        return {"user": user.to_dict()}, 200
+        return {"user": serialize_user(user_data)}, 200
     except Exception as e:
         return {"error": str(e)}, 400
 
 def update_user_profile(user_id, username=None, email=None):
-    # Connect to MongoDB
-    client = MongoClient(current_app.config['MONGO_URI'])
-    db = client.get_database()
+    # Get shared database handle
+    db = get_db()
     users_collection = db.users
     
     # Get user
@@ -53,58 +55,198 @@ def update_user_profile(user_id, username=None, email=None):
         
         # Get updated user
         updated_user_data = users_collection.find_one({"_id": ObjectId(user_id)})
-        updated_user = User.from_dict(updated_user_data)
         
-        return {"user": updated_user.to_dict()}, 200
+        return {"user": serialize_user(updated_user_data)}, 200
     except Exception as e:
         return {"error": str(e)}, 400
 
-def get_user_purchases(user_id):
-    # Connect to MongoDB
-    client = MongoClient(current_app.config['MONGO_URI'])
-    db = client.get_database()
+def get_user_purchases(user_id, limit=None, cursor=None, fields=None):
+    try:
+        fields = parse_fields(fields, PURCHASE_FIELDS)
+    except InvalidFields as e:
+        return {"error": str(e)}, 400
+    
+    # Get shared database handle
+    db = get_db()
     purchases_collection = db.purchases
     
     # Get purchases
     try:
-        purchases_data = purchases_collection.find({"user_id": ObjectId(user_id)}).sort("purchase_date", -1)
-        purchases = [Purchase.from_dict(purchase).to_dict() for purchase in purchases_data]
+        purchases_data, next_cursor = paginate(
+            purchases_collection, {"user_id": ObjectId(user_id)}, "purchase_date", limit, cursor,
+            to_projection(fields)
+        )
+        purchases = [serialize_purchase(purchase, fields) for purchase in purchases_data]
         
-        return {"purchases": purchases}, 200
+        return {"purchases": purchases, "next_cursor": next_cursor}, 200
     except Exception as e:
         return {"error": str(e)}, 400
 
-def create_purchase_from_cart(user_id):
-    # Connect to MongoDB
-    client = MongoClient(current_app.config['MONGO_URI'])
-    db = client.get_database()
+def stream_user_purchases(user_id, fields=None):
+    try:
+        fields = parse_fields(fields, PURCHASE_FIELDS)
+    except InvalidFields as e:
+        return {"error": str(e)}, 400
+    
+    # Get shared database handle
+    db = get_db()
+    purchases_collection = db.purchases
+    
+    # Every purchase of the user, fetched from the server batch by batch
+    purchases_data = purchases_collection.find({"user_id": ObjectId(user_id)}, to_projection(fields)) \
+        .sort([("purchase_date", -1), ("_id", -1)]).batch_size(current_app.config['STREAM_BATCH_SIZE'])
+    
+    return iter_serialized(purchases_data, serialize_purchase, fields), 200
+
+# Per-product totals over every purchased line item; purchases arrive newest
+# first, so $first keeps the title from the latest purchase
+_ITEM_TOTALS = [
+    {"$unwind": "$items"},
+    {"$group": {
+        "_id": "$items.product_id",
+        "title": {"$first": "$items.title"},
+        "quantity": {"$sum": "$items.quantity"},
+        "spent": {"$sum": {"$multiply": ["$items.price", "$items.quantity"]}}
+    }}
+]
+
+def _month_window_start(months, now=None):
+    # First day of the oldest month shown in by_month
+    now = now or datetime.utcnow()
+    month_index = now.year * 12 + now.month - 1 - (max(months, 1) - 1)
+    return datetime(month_index // 12, month_index % 12 + 1, 1)
+
+def _summary_pipeline(user_id, months, top_items):
+    # The $match and $sort are served by the user_purchase_date_id index;
+    # every total is computed in one pass over the user's purchases. The
+    # totals need the whole history, so the scan itself is bounded only by
+    # maxTimeMS; by_month drops purchases outside its window before grouping
+    return [
+        {"$match": {"user_id": ObjectId(user_id)}},
+        {"$sort": {"purchase_date": -1, "_id": -1}},
+        {"$project": {
+            "purchase_date": 1, "total_amount": 1,
+            "items.product_id": 1, "items.title": 1, "items.price": 1, "items.quantity": 1
+        }},
+        {"$facet": {
+            "totals": [
+                {"$group": {
+                    "_id": None,
+                    "total_spent": {"$sum": "$total_amount"},
+                    "order_count": {"$sum": 1},
+                    "first_purchase": {"$min": "$purchase_date"},
+                    "last_purchase": {"$max": "$purchase_date"}
+                }}
+            ],
+            "by_month": [
+                {"$match": {"purchase_date": {"$gte": _month_window_start(months)}}},
+                {"$group": {
+                    "_id": {"$dateToString": {"format": "%Y-%m", "date": "$purchase_date"}},
+                    "spent": {"$sum": "$total_amount"},
+                    "orders": {"$sum": 1}
+                }},
+                {"$sort": {"_id": -1}},
+                {"$limit": months}
+            ],
+            "top_items": _ITEM_TOTALS + [
+                {"$sort": {"spent": -1, "_id": 1}},
+                {"$limit": top_items}
+            ],
+            # Items carry no category, so it is looked up once per distinct product
+            "by_category": _ITEM_TOTALS + [
+                {"$addFields": {"product_oid": {"$convert": {"input": "$_id", "to": "objectId", "onError": None, "onNull": None}}}},
+                {"$lookup": {"from": "products", "localField": "product_oid", "foreignField": "_id", "as": "product"}},
+                {"$group": {
+                    "_id": {"$arrayElemAt": ["$product.category", 0]},
+                    "spent": {"$sum": "$spent"},
+                    "quantity": {"$sum": "$quantity"}
+                }},
+                {"$sort": {"spent": -1, "_id": 1}}
+            ]
+        }}
+    ]
+
+def _money(value):
+    return round(float(value or 0), 2)
+
+def _summary_result(facets):
+    totals = facets["totals"][0] if facets["totals"] else {}
+    return {
+        "total_spent": _money(totals.get("total_spent")),
+        "order_count": totals.get("order_count", 0),
+        "first_purchase": totals.get("first_purchase"),
+        "last_purchase": totals.get("last_purchase"),
+        "by_month": [
+            {"month": month["_id"], "spent": _money(month["spent"]), "orders": month["orders"]}
+            for month in facets["by_month"]
+        ],
+        # Products deleted since the purchase have no category (null)
+        "by_category": [
+            {"category": category.get("_id"), "spent": _money(category["spent"]), "quantity": category["quantity"]}
+            for category in facets["by_category"]
+        ],
+        "top_items": [
+            {"product_id": item["_id"], "title": item["title"], "spent": _money(item["spent"]), "quantity": item["quantity"]}
+            for item in facets["top_items"]
+        ]
+    }
+
+def get_purchase_summary(user_id):
+    config = current_app.config
+    
+    # Get shared database handle
+    db = get_db()
+    purchases_collection = db.purchases
+    
+    # Aggregate server-side, bounded by maxTimeMS
+    try:
+        pipeline = _summary_pipeline(user_id, config['PURCHASE_SUMMARY_MONTHS'], config['PURCHASE_SUMMARY_TOP_ITEMS'])
+        facets = next(purchases_collection.aggregate(pipeline, maxTimeMS=config['PURCHASE_SUMMARY_MAX_TIME_MS']))
+        return {"summary": _summary_result(facets)}, 200
+    except ExecutionTimeout:
+        return {"error": "Purchase summary took too long"}, 503
+    except Exception as e:
+        return {"error": str(e)}, 400
+
+def _checkout(db, user_id, session=None):
     carts_collection = db.carts
     products_collection = db.products
     purchases_collection = db.purchases
     
-    # Get cart
-    cart_data = carts_collection.find_one({"user_id": ObjectId(user_id)})
-    if not cart_data or not cart_data.get("items"):
-        return {"error": "Cart is empty"}, 400
+    # Read and empty the cart in one atomic step so concurrent checkouts
+    # of the same cart cannot both succeed
+    cart_data = carts_collection.find_one_and_update(
+        {"user_id": ObjectId(user_id), "items.0": {"$exists": True}},
+        {"$set": {"items": [], "updated_at": datetime.utcnow()}},
+        return_document=ReturnDocument.BEFORE,
+        session=session
+    )
+    if not cart_data:
+        return None
     
-    # Create cart object
-    cart = Cart.from_dict(cart_data)
+    # Load title and price of every cart product in one query
+    product_ids = [ObjectId(item["product_id"]) for item in cart_data["items"] if ObjectId.is_valid(item.get("product_id"))]
+    products_by_id = {
+        str(product_data["_id"]): product_data
+        for product_data in products_collection.find(
+            {"_id": {"$in": product_ids}}, {"title": 1, "price": 1}, session=session
+        )
+    }
     
-    # Create purchase items
+    # Create purchase items, skipping products that no longer exist
     purchase_items = []
     total_amount = 0
-    
-    for item in cart.items:
-        product_data = products_collection.find_one({"_id": ObjectId(item.product_id)})
+    for item in cart_data["items"]:
+        product_data = products_by_id.get(str(item.get("product_id")))
         if product_data:
             purchase_item = PurchaseItem(
-                product_id=item.product_id,
+                product_id=item["product_id"],
                 title=product_data["title"],
                 price=product_data["price"],
-                quantity=item.quantity
+                quantity=item["quantity"]
             )
             purchase_items.append(purchase_item)
-            total_amount += product_data["price"] * item.quantity
+            total_amount += purchase_item.price * purchase_item.quantity
     
     # Create purchase
     purchase = Purchase(
@@ -114,22 +256,38 @@ def create_purchase_from_cart(user_id):
     )
     
     # Insert purchase into database
-    result = purchases_collection.insert_one({
-        "_id": purchase._id,
-        "user_id": purchase.user_id,
-        "items": [item.to_dict() for item in purchase.items],
-        "total_amount": purchase.total_amount,
-        "purchase_date": purchase.purchase_date
-    })
-    
-    # Clear cart
-    cart.clear()
-    carts_collection.update_one(
-        {"_id": cart._id},
-        {"$set": {
-            "items": [],
-            "updated_at": cart.updated_at
-        }}
-    )
+    try:
+        purchases_collection.insert_one({
+            "_id": purchase._id,
+            "user_id": purchase.user_id,
+            "items": [item.to_dict() for item in purchase.items],
+            "total_amount": purchase.total_amount,
+            "purchase_date": purchase.purchase_date
+        }, session=session)
+    except PyMongoError:
+        # Without a transaction, put the items back so the cart is not lost
+        if session is None:
+            carts_collection.update_one(
+                {"_id": cart_data["_id"]},
+                {"$push": {"items": {"$each": cart_data["items"], "$position": 0}}}
+            )
+        raise
+    
+    return purchase
+
+def create_purchase_from_cart(user_id):
+    # Get shared database handle
+    db = get_db()
+    
+    # Run the checkout in a multi-document transaction when the deployment
+    # supports it (replica set or sharded cluster)
+    if current_app.config.get('MONGO_USE_TRANSACTIONS'):
+        with get_client().start_session() as session:
+            purchase = session.with_transaction(lambda s: _checkout(db, user_id, session=s))
+    else:
+        purchase = _checkout(db, user_id)
+    
+    if purchase is None:
+        return {"error": "Cart is empty"}, 400
     
     return {"purchase": purchase.to_dict()}, 201
\ No newline at end of file
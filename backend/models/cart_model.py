@@ -2,6 +2,8 @@ from datetime import datetime
 from bson import ObjectId
 
 class CartItem:
+    __slots__ = ("product_id", "quantity", "added_at", "_id")
+    
     def __init__(self, product_id, quantity=1, added_at=None, _id=None):
         self.product_id = product_id
         self.quantity = quantity
@@ -17,6 +19,8 @@ class CartItem:
         }
 
 class Cart:
+    __slots__ = ("user_id", "items", "created_at", "updated_at", "_id")
+    
     def __init__(self, user_id, items=None, created_at=None, updated_at=None, _id=None):
         self.user_id = user_id
         self.items = items or []
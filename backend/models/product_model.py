@@ -3,18 +3,27 @@ from bson import ObjectId
 from slugify import slugify
 
 class Product:
+    # Write-path model; reads are serialized straight from BSON
+    __slots__ = ("title", "description", "category", "price", "image_url", "images",
+                 "seller_id", "created_at", "updated_at", "_id", "slug")
+    
     def __init__(self, title, description, category, price, image_url=None, 
-                 seller_id=None, created_at=None, updated_at=None, _id=None):
+                 seller_id=None, created_at=None, updated_at=None, _id=None, images=None):
         self.title = title
         self.description = description
         self.category = category
         self.price = float(price)
         self.image_url = image_url or ""
+        self.images = images or {}
         self.seller_id = seller_id
         self.created_at = created_at or datetime.utcnow()
         self.updated_at = updated_at or datetime.utcnow()
         self._id = _id or ObjectId()
-        self.slug = slugify(title)
+        self.slug = self.make_slug(title)
+    
+    @staticmethod
+    def make_slug(title):
+        return slugify(title)
     
     def to_dict(self):
         return {
@@ -24,6 +33,7 @@ class Product:
             "category": self.category,
             "price": self.price,
             "image_url": self.image_url,
+            "images": self.images,
             "seller_id": str(self.seller_id) if self.seller_id else None,
             "created_at": self.created_at,
             "updated_at": self.updated_at,
@@ -40,6 +50,7 @@ class Product:
             category=data.get('category'),
             price=data.get('price'),
             image_url=data.get('image_url'),
+            images=data.get('images'),
             seller_id=data.get('seller_id'),
             created_at=data.get('created_at'),
             updated_at=data.get('updated_at'),
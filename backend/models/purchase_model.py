@@ -2,6 +2,8 @@ from datetime import datetime
 from bson import ObjectId
 
 class PurchaseItem:
+    __slots__ = ("product_id", "title", "price", "quantity", "_id")
+    
     def __init__(self, product_id, title, price, quantity=1, _id=None):
         self.product_id = product_id
         self.title = title
@@ -19,6 +21,8 @@ class PurchaseItem:
         }
 
 class Purchase:
+    __slots__ = ("user_id", "items", "total_amount", "purchase_date", "_id")
+    
     def __init__(self, user_id, items, total_amount, purchase_date=None, _id=None):
         self.user_id = user_id
         self.items = items
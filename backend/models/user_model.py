@@ -3,6 +3,8 @@ from bson import ObjectId
 import bcrypt
 
 class User:
+    __slots__ = ("email", "password", "username", "created_at", "_id")
+    
     def __init__(self, email, password, username=None, created_at=None, _id=None):
         self.email = email
         self.password = password  # This should be hashed before storing
@@ -11,8 +13,13 @@ class User:
         self._id = _id or ObjectId()
     
     @staticmethod
-    def hash_password(password):
-        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    def hash_password(password, rounds=12):
+        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds)).decode('utf-8')
+    
+    @staticmethod
+    def password_rounds(hashed_password):
+        # bcrypt hashes look like $2b$<cost>$<salt+hash>
+        return int(hashed_password.split('$')[2])
     
     @staticmethod
     def check_password(hashed_password, password):
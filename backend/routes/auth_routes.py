@@ -1,8 +1,12 @@
 from flask import Blueprint, request, jsonify
 from backend.controllers.auth_controller import register_user, login_user
+from backend.utils.rate_limit import limit_auth_requests
 
 auth_bp = Blueprint('auth', __name__)
 
+# Throttle by client address and target email before any work is done
+auth_bp.before_request(limit_auth_requests)
+
 @auth_bp.route('/register', methods=['POST'])
 def register():
     data = request.get_json()
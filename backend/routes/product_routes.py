@@ -1,10 +1,16 @@
 from flask import Blueprint, request, jsonify, current_app
 from backend.controllers.product_controller import (
     get_all_products, get_product_by_id, create_product,
-    update_product, delete_product, get_user_products
+    update_product, delete_product, get_user_products, stream_products,
+    stream_user_products, import_products
 )
 from backend.utils.auth_utils import token_required
+from backend.utils.response_utils import conditional_response
+from backend.utils.streaming import stream_response, export_response, STREAM_FORMATS, EXPORT_FORMATS
+from backend.utils.serializers import PRODUCT_EXPORT_COLUMNS
+from backend.utils.product_import import detect_format
 from werkzeug.utils import secure_filename
+from werkzeug.exceptions import RequestEntityTooLarge
 import os
 
 product_bp = Blueprint('product', __name__)
@@ -13,14 +19,27 @@ product_bp = Blueprint('product', __name__)
 def get_products():
     category = request.args.get('category')
     search_query = request.args.get('search')
+    limit = request.args.get('limit', type=int)
+    cursor = request.args.get('cursor')
+    fields = request.args.get('fields')
+    stream_format = request.args.get('stream')
     
-    result, status_code = get_all_products(category, search_query)
-    return jsonify(result), status_code
+    # Stream every match instead of one page (?stream=json|ndjson)
+    if stream_format:
+        if stream_format not in STREAM_FORMATS:
+            return jsonify({"error": "stream must be one of: json, ndjson"}), 400
+        result, status_code = stream_products(category, search_query, fields)
+        if status_code != 200:
+            return jsonify(result), status_code
+        return stream_response(result, "products", stream_format)
+    
+    result, status_code = get_all_products(category, search_query, limit, cursor, fields)
+    return conditional_response(result, status_code)
 
 @product_bp.route('/<product_id>', methods=['GET'])
 def get_product(product_id):
-    result, status_code = get_product_by_id(product_id)
-    return jsonify(result), status_code
+    result, status_code = get_product_by_id(product_id, request.args.get('fields'))
+    return conditional_response(result, status_code)
 
 @product_bp.route('/', methods=['POST'])
 @token_required
@@ -48,6 +67,37 @@ def add_product(current_user):
     
     return jsonify(result), status_code
 
+@product_bp.route('/import', methods=['POST'])
+@token_required
+def import_product_file(current_user):
+    # Imports have their own size limit, checked before anything is read
+    max_bytes = current_app.config['IMPORT_MAX_BYTES']
+    if request.content_length is not None and request.content_length > max_bytes:
+        return jsonify({"error": f"Imports are limited to {max_bytes} bytes"}), 413
+    
+    # Multipart "file" field or the raw request body
+    try:
+        upload = request.files.get('file') if request.mimetype == 'multipart/form-data' else None
+    except RequestEntityTooLarge:
+        return jsonify({"error": "Request body is too large"}), 413
+    if upload is not None:
+        stream, mimetype, filename = upload.stream, upload.mimetype, upload.filename
+    else:
+        stream, mimetype, filename = request.stream, request.mimetype, None
+    
+    import_format = detect_format(request.args.get('format'), mimetype, filename)
+    if import_format is None:
+        return jsonify({"error": "format must be one of: csv, ndjson"}), 400
+    
+    result, status_code = import_products(
+        stream,
+        import_format,
+        seller_id=current_user,
+        ordered=request.args.get('ordered', 'false').lower() == 'true',
+        batch_size=request.args.get('batch_size', type=int)
+    )
+    return jsonify(result), status_code
+
 @product_bp.route('/<product_id>', methods=['PUT'])
 @token_required
 def edit_product(current_user, product_id):
@@ -79,5 +129,24 @@ def remove_product(current_user, product_id):
 @product_bp.route('/user', methods=['GET'])
 @token_required
 def get_my_products(current_user):
-    result, status_code = get_user_products(current_user)
-    return jsonify(result), status_code
\ No newline at end of file
+    limit = request.args.get('limit', type=int)
+    cursor = request.args.get('cursor')
+    fields = request.args.get('fields')
+    
+    result, status_code = get_user_products(current_user, limit, cursor, fields)
+    return jsonify(result), status_code
+
+@product_bp.route('/user/export', methods=['GET'])
+@token_required
+def export_my_products(current_user):
+    export_format = request.args.get('format', 'csv')
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({"error": "format must be one of: csv, ndjson"}), 400
+    
+    result, status_code = stream_user_products(current_user)
+    if status_code != 200:
+        return jsonify(result), status_code
+    return export_response(
+        result, export_format, "listings", PRODUCT_EXPORT_COLUMNS,
+        compress=request.args.get('gzip', 'false').lower() == 'true'
+    )
\ No newline at end of file
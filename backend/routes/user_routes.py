@@ -1,8 +1,12 @@
 from flask import Blueprint, request, jsonify
 from backend.controllers.user_controller import (
-    get_user_profile, update_user_profile, get_user_purchases
+    get_user_profile, update_user_profile, get_user_purchases, stream_user_purchases,
+    get_purchase_summary
 )
 from backend.utils.auth_utils import token_required
+from backend.utils.response_utils import conditional_response
+from backend.utils.streaming import stream_response, export_response, iter_flattened, STREAM_FORMATS, EXPORT_FORMATS
+from backend.utils.serializers import purchase_export_rows, PURCHASE_EXPORT_COLUMNS
 
 user_bp = Blueprint('user', __name__)
 
@@ -10,7 +14,7 @@ user_bp = Blueprint('user', __name__)
 @token_required
 def get_profile(current_user):
     result, status_code = get_user_profile(current_user)
-    return jsonify(result), status_code
+    return conditional_response(result, status_code, private=True)
 
 @user_bp.route('/profile', methods=['PUT'])
 @token_required
@@ -29,5 +33,43 @@ def update_profile(current_user):
 @user_bp.route('/purchases', methods=['GET'])
 @token_required
 def get_purchases(current_user):
-    result, status_code = get_user_purchases(current_user)
-    return jsonify(result), status_code
\ No newline at end of file
+    limit = request.args.get('limit', type=int)
+    cursor = request.args.get('cursor')
+    fields = request.args.get('fields')
+    stream_format = request.args.get('stream')
+    
+    # Stream the whole history instead of one page (?stream=json|ndjson)
+    if stream_format:
+        if stream_format not in STREAM_FORMATS:
+            return jsonify({"error": "stream must be one of: json, ndjson"}), 400
+        result, status_code = stream_user_purchases(current_user, fields)
+        if status_code != 200:
+            return jsonify(result), status_code
+        return stream_response(result, "purchases", stream_format)
+    
+    result, status_code = get_user_purchases(current_user, limit, cursor, fields)
+    return conditional_response(result, status_code, private=True)
+
+@user_bp.route('/purchases/summary', methods=['GET'])
+@token_required
+def get_purchases_summary(current_user):
+    result, status_code = get_purchase_summary(current_user)
+    return conditional_response(result, status_code, private=True)
+
+@user_bp.route('/purchases/export', methods=['GET'])
+@token_required
+def export_purchases(current_user):
+    export_format = request.args.get('format', 'csv')
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({"error": "format must be one of: csv, ndjson"}), 400
+    
+    result, status_code = stream_user_purchases(current_user)
+    if status_code != 200:
+        return jsonify(result), status_code
+    # CSV gets one row per purchased item
+    if export_format == "csv":
+        result = iter_flattened(result, purchase_export_rows)
+    return export_response(
+        result, export_format, "purchases", PURCHASE_EXPORT_COLUMNS,
+        compress=request.args.get('gzip', 'false').lower() == 'true'
+    )
\ No newline at end of file
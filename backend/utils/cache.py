@@ -0,0 +1,148 @@
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app
+
+class CacheBackend:
+    # Interface for response caches. Entries can carry tags so a group of
+    # keys (e.g. every listing page of one category) is invalidated at once.
+    # A shared backend (Redis, memcached) implements the same methods.
+    def get(self, key):
+        raise NotImplementedError
+    
+    def set(self, key, value, ttl=None, tags=()):
+        raise NotImplementedError
+    
+    def delete(self, key):
+        raise NotImplementedError
+    
+    def invalidate_tags(self, tags):
+        raise NotImplementedError
+    
+    def clear(self):
+        raise NotImplementedError
+    
+    def stats(self):
+        raise NotImplementedError
+
+class MemoryCache(CacheBackend):
+    # Thread-safe LRU cache with per-entry TTL, bounded by entry count
+    def __init__(self, max_entries=1024, default_ttl=30):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries = OrderedDict()  # key -> (expires_at, value, tags)
+        self._tags = {}  # tag -> set of keys
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[0] <= time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+    
+    def set(self, key, value, ttl=None, tags=()):
+        ttl = self.default_ttl if ttl is None else ttl
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, value, tuple(tags))
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            
+            # Evict least recently used entries beyond the bound
+            while len(self._entries) > self.max_entries:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+    
+    def delete(self, key):
+        with self._lock:
+            self._remove(key)
+    
+    def invalidate_tags(self, tags):
+        with self._lock:
+            for tag in tags:
+                for key in self._tags.pop(tag, ()):
+                    self._remove(key)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+    
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
+    
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+class NullCache(CacheBackend):
+    # Used when caching is disabled; every lookup misses
+    def get(self, key):
+        return None
+    
+    def set(self, key, value, ttl=None, tags=()):
+        pass
+    
+    def delete(self, key):
+        pass
+    
+    def invalidate_tags(self, tags):
+        pass
+    
+    def clear(self):
+        pass
+    
+    def stats(self):
+        return {}
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def set_cache(backend):
+    global _cache
+    with _cache_lock:
+        _cache = backend
+
+def get_cache(config=None):
+    global _cache
+    if _cache is not None:
+        return _cache
+    
+    with _cache_lock:
+        if _cache is None:
+            config = config if config is not None else current_app.config
+            if config.get('CACHE_ENABLED', True):
+                _cache = MemoryCache(
+                    max_entries=config.get('CACHE_MAX_ENTRIES', 1024),
+                    default_ttl=config.get('CACHE_TTL', 30)
+                )
+            else:
+                _cache = NullCache()
+    return _cache
\ No newline at end of file
@@ -0,0 +1,68 @@
+import os
+import threading
+from flask import current_app
+from pymongo import MongoClient
+from backend.utils.metrics import command_metrics
+from backend.utils.slow_query_log import get_slow_query_log
+
+# One MongoClient per process. MongoClient is thread-safe and keeps its own
+# connection pool, so every request in this process shares it.
+_client = None
+_client_pid = None
+_client_lock = threading.Lock()
+
+def _client_options(config):
+    options = {
+        "maxPoolSize": config.get('MONGO_MAX_POOL_SIZE', 100),
+        "minPoolSize": config.get('MONGO_MIN_POOL_SIZE', 0),
+        "maxIdleTimeMS": config.get('MONGO_MAX_IDLE_TIME_MS'),
+        "waitQueueTimeoutMS": config.get('MONGO_WAIT_QUEUE_TIMEOUT_MS'),
+        "connectTimeoutMS": config.get('MONGO_CONNECT_TIMEOUT_MS', 20000),
+        "socketTimeoutMS": config.get('MONGO_SOCKET_TIMEOUT_MS'),
+        "serverSelectionTimeoutMS": config.get('MONGO_SERVER_SELECTION_TIMEOUT_MS', 30000),
+    }
+    listeners = []
+    if config.get('METRICS_ENABLED'):
+        listeners.append(command_metrics)
+    if config.get('SLOW_QUERY_LOG_ENABLED'):
+        listeners.append(get_slow_query_log(config))
+    if listeners:
+        options["event_listeners"] = listeners
+    return options
+
+def get_client(config=None):
+    global _client, _client_pid
+    
+    # A client inherited from a parent process must not be reused after fork
+    pid = os.getpid()
+    if _client is not None and _client_pid == pid:
+        return _client
+    
+    with _client_lock:
+        if _client is None or _client_pid != pid:
+            config = config if config is not None else current_app.config
+            _client = MongoClient(config['MONGO_URI'], **_client_options(config))
+            _client_pid = pid
+    return _client
+
+def get_db(config=None):
+    return get_client(config).get_database()
+
+def close_client():
+    global _client, _client_pid
+    with _client_lock:
+        if _client is not None and _client_pid == os.getpid():
+            _client.close()
+        _client = None
+        _client_pid = None
+
+def _reset_after_fork():
+    # Drop the parent's client (its sockets and monitor threads belong to the
+    # parent) so the child lazily builds its own pool on first use.
+    global _client, _client_pid, _client_lock
+    _client = None
+    _client_pid = None
+    _client_lock = threading.Lock()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
\ No newline at end of file
@@ -0,0 +1,26 @@
+# Sparse fieldsets: a client-supplied ?fields= list, checked against an
+# allow-list and pushed down to MongoDB as a projection
+
+class InvalidFields(ValueError):
+    pass
+
+PRODUCT_FIELDS = ("_id", "title", "description", "category", "price", "image_url", "images",
+                  "seller_id", "created_at", "updated_at", "slug")
+PURCHASE_FIELDS = ("_id", "user_id", "items", "total_amount", "purchase_date")
+
+def parse_fields(raw, allowed):
+    if not raw:
+        return None
+    
+    requested = {field.strip() for field in raw.split(",") if field.strip()}
+    unknown = sorted(requested.difference(allowed))
+    if unknown:
+        raise InvalidFields(f"Unknown fields: {', '.join(unknown)}")
+    
+    # _id is always returned; keep the allow-list order for stable output
+    return tuple(field for field in allowed if field in requested or field == "_id")
+
+def to_projection(fields):
+    if fields is None:
+        return None
+    return {field: 1 for field in fields}
\ No newline at end of file
@@ -0,0 +1,51 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image, ImageOps
+
+# Bounding boxes of the renditions generated for every product image
+RENDITIONS = {
+    "thumbnail": (160, 160),
+    "card": (480, 480),
+    "detail": (1200, 1200)
+}
+
+_FORMAT_EXTENSIONS = {"WEBP": "webp", "JPEG": "jpg"}
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+def _get_executor(max_workers):
+    global _executor, _executor_pid
+    
+    # Threads do not survive fork, so each process builds its own pool
+    pid = os.getpid()
+    with _executor_lock:
+        if _executor is None or _executor_pid != pid:
+            _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="image-worker")
+            _executor_pid = pid
+    return _executor
+
+def submit_image_job(config, fn, *args):
+    return _get_executor(config.get('IMAGE_WORKERS', 2)).submit(fn, *args)
+
+def create_renditions(source_path, output_dir, base_name, image_format="WEBP", quality=80):
+    # Re-encode every rendition from pixels only, so EXIF (GPS, camera
+    # serials) and other metadata in the upload are dropped
+    extension = _FORMAT_EXTENSIONS[image_format]
+    renditions = {}
+    
+    with Image.open(source_path) as source:
+        source = ImageOps.exif_transpose(source)
+        mode = "RGBA" if image_format == "WEBP" and source.mode in ("RGBA", "LA", "P") else "RGB"
+        source = source.convert(mode)
+        
+        for name, size in RENDITIONS.items():
+            rendition = source.copy()
+            rendition.thumbnail(size, Image.LANCZOS)
+            filename = f"{base_name}_{name}.{extension}"
+            rendition.save(os.path.join(output_dir, filename), image_format, quality=quality, optimize=True)
+            renditions[name] = filename
+    
+    return renditions
\ No newline at end of file
@@ -0,0 +1,94 @@
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
+from pymongo.errors import OperationFailure
+
+# Indexes for every collection, shaped after the controllers' queries:
+# equality fields first, then the sort key with _id as the keyset tie-breaker.
+INDEXES = {
+    "users": [
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+    ],
+    "products": [
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_at_id"),
+        IndexModel([("category", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], name="category_created_at_id"),
+        IndexModel([("seller_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], name="seller_created_at_id"),
+        IndexModel([("image_hash", ASCENDING)], name="image_hash"),
+        IndexModel(
+            [("title", TEXT), ("description", TEXT)],
+            name="title_description_text",
+            weights={"title": 10, "description": 1},
+            default_language="english"
+        ),
+    ],
+    "carts": [
+        # Required: add_to_cart's upsert relies on it to keep one cart per user
+        IndexModel([("user_id", ASCENDING)], name="user_id_unique", unique=True),
+    ],
+    "purchases": [
+        IndexModel([("user_id", ASCENDING), ("purchase_date", DESCENDING), ("_id", DESCENDING)], name="user_purchase_date_id"),
+    ],
+}
+
+# Representative query shape of each endpoint, used by the explain report.
+# Values are placeholders; only the shape matters to the planner.
+def _query_shapes():
+    some_id = ObjectId()
+    return [
+        ("POST /api/auth/login", "users", {"email": "user@example.com"}, None),
+        ("GET /api/users/profile", "users", {"_id": some_id}, None),
+        ("GET /api/products/", "products", {}, [("created_at", DESCENDING), ("_id", DESCENDING)]),
+        ("GET /api/products/?category=", "products", {"category": "Electronics"}, [("created_at", DESCENDING), ("_id", DESCENDING)]),
+        ("GET /api/products/?search=", "products", {"$text": {"$search": "lamp"}}, None),
+        ("GET /api/products/<id>", "products", {"_id": some_id}, None),
+        ("GET /api/products/user", "products", {"seller_id": some_id}, [("created_at", DESCENDING), ("_id", DESCENDING)]),
+        ("GET /api/cart/", "carts", {"user_id": some_id}, None),
+        ("GET /api/users/purchases", "purchases", {"user_id": some_id}, [("purchase_date", DESCENDING), ("_id", DESCENDING)]),
+        ("GET /api/users/purchases/summary", "purchases", {"user_id": some_id}, None),
+    ]
+
+def ensure_indexes(db):
+    # create_indexes is a no-op for indexes that already exist with the same spec
+    created = {}
+    for collection_name, indexes in INDEXES.items():
+        try:
+            created[collection_name] = db[collection_name].create_indexes(indexes)
+        except OperationFailure as e:
+            print(f"Failed to create indexes on {collection_name}: {e}")
+            created[collection_name] = []
+    return created
+
+def _plan_stages(plan):
+    # Walk a (possibly nested) winning plan and collect every stage name
+    stages = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for value in plan.values():
+            stages.extend(_plan_stages(value))
+    elif isinstance(plan, list):
+        for value in plan:
+            stages.extend(_plan_stages(value))
+    return stages
+
+def index_report(db):
+    report = []
+    for endpoint, collection_name, query, sort in _query_shapes():
+        cursor = db[collection_name].find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+        winning_plan = cursor.explain().get("queryPlanner", {}).get("winningPlan", {})
+        stages = _plan_stages(winning_plan)
+        report.append({
+            "endpoint": endpoint,
+            "collection": collection_name,
+            "stages": stages,
+            "collscan": "COLLSCAN" in stages
+        })
+    return report
+
+def print_index_report(db):
+    report = index_report(db)
+    for entry in report:
+        status = "COLLSCAN" if entry["collscan"] else "ok"
+        print(f"{status:<9} {entry['endpoint']:<32} {entry['collection']:<10} {' <- '.join(entry['stages'])}")
+    return report
\ No newline at end of file
@@ -0,0 +1,56 @@
+import json
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from bson import ObjectId, Decimal128
+from flask.json.provider import JSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - fall back to the standard library
+    orjson = None
+
+def _default(value):
+    # Types neither encoder handles on its own
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, Decimal128):
+        return str(value.to_decimal())
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, datetime):
+        # Mongo returns naive UTC datetimes
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+class FastJSONProvider(JSONProvider):
+    # JSON provider backed by orjson. Serializes ObjectId, datetime (ISO 8601,
+    # naive values treated as UTC) and Decimal without going through
+    # str() in to_dict(); output is compact unless the app is in debug mode
+    # or compact=True is passed (e.g. for NDJSON lines).
+    def dumps(self, obj, compact=False, **kwargs):
+        return self._dumps_bytes(obj, compact).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        if orjson is not None:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self._dumps_bytes(obj), mimetype="application/json")
+    
+    def _dumps_bytes(self, obj, compact=False):
+        pretty = self._app.debug and not compact
+        if orjson is not None:
+            options = orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+            if pretty:
+                options |= orjson.OPT_INDENT_2
+            return orjson.dumps(obj, default=_default, option=options)
+        
+        if pretty:
+            return json.dumps(obj, default=_default, ensure_ascii=False, indent=2).encode('utf-8')
+        return json.dumps(obj, default=_default, ensure_ascii=False, separators=(",", ":")).encode('utf-8')
\ No newline at end of file
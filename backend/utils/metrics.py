@@ -0,0 +1,219 @@
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+from flask import request, g, Response, abort
+from pymongo import monitoring
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COMMAND_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+DOCUMENT_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+COMMAND_COUNT_BUCKETS = (0, 1, 2, 3, 4, 6, 8, 12, 16, 24, 32, 64)
+
+class Histogram:
+    # Cumulative-bucket histogram keyed by label values, rendered in the
+    # Prometheus text format. Values are per process.
+    def __init__(self, name, description, label_names, buckets):
+        self.name = name
+        self.description = description
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series = {}  # label values -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+    
+    def observe(self, value, *label_values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 2)
+            for i in range(index, len(self.buckets)):
+                series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+    
+    def render(self):
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series_items = sorted(self._series.items())
+            series_items = [(label_values, list(series)) for label_values, series in series_items]
+        for label_values, series in series_items:
+            labels = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(self.label_names, label_values))
+            prefix = labels + "," if labels else ""
+            for bound, count in zip(self.buckets, series):
+                lines.append(f'{self.name}_bucket{{{prefix}le="{bound}"}} {count}')
+            lines.append(f'{self.name}_bucket{{{prefix}le="+Inf"}} {series[-1]}')
+            lines.append(f"{self.name}_sum{{{labels}}} {series[-2]}")
+            lines.append(f"{self.name}_count{{{labels}}} {series[-1]}")
+        return "\n".join(lines)
+    
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "Time spent handling a request, by endpoint.",
+    ("method", "endpoint", "status"), LATENCY_BUCKETS
+)
+COMMAND_DURATION = Histogram(
+    "mongo_command_duration_seconds", "MongoDB command round-trip time, by calling endpoint.",
+    ("endpoint", "command", "collection", "outcome"), COMMAND_BUCKETS
+)
+COMMAND_DOCUMENTS = Histogram(
+    "mongo_command_documents", "Documents returned (reads) or affected (writes) per MongoDB command.",
+    ("endpoint", "command", "collection"), DOCUMENT_BUCKETS
+)
+REQUEST_COMMANDS = Histogram(
+    "mongo_commands_per_request", "MongoDB commands issued while handling one request; N+1 patterns show up here.",
+    ("endpoint",), COMMAND_COUNT_BUCKETS
+)
+PASSWORD_HASH_WAIT = Histogram(
+    "password_hash_wait_seconds", "Time a bcrypt job waited for a pool worker.",
+    ("operation",), LATENCY_BUCKETS
+)
+PASSWORD_HASH_DURATION = Histogram(
+    "password_hash_duration_seconds", "Time a bcrypt job ran on a pool worker.",
+    ("operation",), LATENCY_BUCKETS
+)
+HISTOGRAMS = (REQUEST_DURATION, REQUEST_COMMANDS, COMMAND_DURATION, COMMAND_DOCUMENTS,
+              PASSWORD_HASH_WAIT, PASSWORD_HASH_DURATION)
+
+# Gauges and counters whose values live elsewhere; each collector returns
+# its metrics as Prometheus text lines
+_collectors = []
+
+def register_collector(collect):
+    _collectors.append(collect)
+
+class RequestMetrics:
+    __slots__ = ("endpoint", "started_at", "commands", "recorded")
+    
+    def __init__(self, endpoint):
+        self.endpoint = endpoint
+        self.started_at = time.perf_counter()
+        self.commands = 0
+        self.recorded = False
+
+# The request being handled in this thread (WSGI) or task (ASGI); driver
+# events are delivered on the same thread or task that issued the command
+_current = ContextVar("request_metrics", default=None)
+
+def start_request(endpoint):
+    return _current.set(RequestMetrics(endpoint or "unmatched"))
+
+def current_request():
+    return _current.get()
+
+def resume_request(metrics):
+    # Makes metrics current again for a body sent after the request context
+    # ended; returns None when it still is current
+    return _current.set(metrics) if _current.get() is not metrics else None
+
+def finish_request(method, status, metrics=None):
+    metrics = metrics if metrics is not None else _current.get()
+    if metrics is None or metrics.recorded:
+        return
+    metrics.recorded = True
+    REQUEST_DURATION.observe(time.perf_counter() - metrics.started_at, method, metrics.endpoint, str(status))
+    REQUEST_COMMANDS.observe(metrics.commands, metrics.endpoint)
+
+def end_request(token):
+    _current.reset(token)
+
+def iter_recorded(body, metrics, method, status):
+    # Streamed bodies run their getMores after the view returns: count them
+    # against the request and record it once the body has been sent
+    token = resume_request(metrics)
+    try:
+        yield from body
+    finally:
+        finish_request(method, status, metrics)
+        if token is not None:
+            end_request(token)
+
+def _returned_documents(command_name, reply):
+    cursor = reply.get("cursor")
+    if isinstance(cursor, dict):
+        return len(cursor.get("firstBatch", cursor.get("nextBatch", ())))
+    if command_name == "findAndModify":
+        return 1 if reply.get("value") is not None else 0
+    return reply.get("n", 0)
+
+class CommandMetrics(monitoring.CommandListener):
+    # Times every command and attributes it to the endpoint that issued it.
+    # The collection is only known from the started event, so it is kept
+    # until the matching succeeded/failed event arrives.
+    def __init__(self):
+        self._pending = {}
+        self._lock = threading.Lock()
+    
+    def started(self, event):
+        command_name = event.command_name
+        collection = event.command.get(command_name)
+        if command_name == "getMore":
+            collection = event.command.get("collection")
+        if not isinstance(collection, str):
+            collection = ""
+        metrics = _current.get()
+        if metrics is not None:
+            metrics.commands += 1
+        with self._lock:
+            self._pending[(event.connection_id, event.request_id)] = (
+                collection, metrics.endpoint if metrics is not None else "background"
+            )
+    
+    def succeeded(self, event):
+        collection, endpoint = self._pop(event)
+        COMMAND_DURATION.observe(event.duration_micros / 1e6, endpoint, event.command_name, collection, "success")
+        COMMAND_DOCUMENTS.observe(_returned_documents(event.command_name, event.reply), endpoint, event.command_name, collection)
+    
+    def failed(self, event):
+        collection, endpoint = self._pop(event)
+        COMMAND_DURATION.observe(event.duration_micros / 1e6, endpoint, event.command_name, collection, "failure")
+    
+    def _pop(self, event):
+        with self._lock:
+            return self._pending.pop((event.connection_id, event.request_id), ("", "background"))
+
+command_metrics = CommandMetrics()
+
+def render_metrics():
+    sections = [histogram.render() for histogram in HISTOGRAMS]
+    sections.extend("\n".join(collect()) for collect in _collectors)
+    return "\n\n".join(section for section in sections if section) + "\n"
+
+def init_metrics(app):
+    # Request timing hooks and the /metrics route for the Flask app
+    @app.before_request
+    def start_request_metrics():
+        g.metrics_token = start_request(request.endpoint)
+    
+    @app.after_request
+    def record_request_metrics(response):
+        metrics = current_request()
+        if response.is_streamed and not response.direct_passthrough and metrics is not None:
+            g.metrics_deferred = True
+            response.response = iter_recorded(response.response, metrics, request.method, response.status_code)
+        else:
+            finish_request(request.method, response.status_code)
+        return response
+    
+    @app.teardown_request
+    def end_request_metrics(exc):
+        token = g.pop("metrics_token", None)
+        if token is None:
+            return
+        # A request that raised never reached after_request
+        if not g.pop("metrics_deferred", False):
+            finish_request(request.method, 500)
+        end_request(token)
+    
+    @app.route('/metrics')
+    def metrics():
+        expected = app.config.get('METRICS_TOKEN')
+        if expected and request.headers.get('Authorization') != f"Bearer {expected}":
+            abort(401)
+        return Response(render_metrics(), mimetype="text/plain; version=0.0.4")
\ No newline at end of file
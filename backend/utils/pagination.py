@@ -0,0 +1,104 @@
+import base64
+import json
+from datetime import datetime
+from bson import ObjectId
+from bson.errors import InvalidId
+from flask import current_app
+from pymongo import DESCENDING
+
+class InvalidCursor(ValueError):
+    pass
+
+def clamp_limit(limit, config=None):
+    # Fall back to the default page size and never exceed the configured maximum
+    config = config if config is not None else current_app.config
+    default_size = config.get('DEFAULT_PAGE_SIZE', 24)
+    max_size = config.get('MAX_PAGE_SIZE', 100)
+    if limit is None or limit <= 0:
+        return default_size
+    return min(limit, max_size)
+
+def encode_cursor(sort_value, _id):
+    # Dates are stored as ISO strings, relevance scores as plain numbers
+    if isinstance(sort_value, datetime):
+        payload = {"d": sort_value.isoformat(), "id": str(_id)}
+    else:
+        payload = {"n": sort_value, "id": str(_id)}
+    payload = json.dumps(payload, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip("=")
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        if "d" in payload:
+            sort_value = datetime.fromisoformat(payload["d"])
+        else:
+            sort_value = float(payload["n"])
+        return sort_value, ObjectId(payload["id"])
+    except (ValueError, KeyError, TypeError, InvalidId):
+        raise InvalidCursor("Invalid cursor")
+
+def _after_cursor(sort_field, cursor):
+    # Documents strictly after the cursor in (sort_field desc, _id desc) order
+    sort_value, last_id = decode_cursor(cursor)
+    return {"$or": [
+        {sort_field: {"$lt": sort_value}},
+        {sort_field: sort_value, "_id": {"$lt": last_id}}
+    ]}
+
+def keyset_query(query, sort_field, cursor):
+    if not cursor:
+        return query
+    after_cursor = _after_cursor(sort_field, cursor)
+    if not query:
+        return after_cursor
+    return {"$and": [query, after_cursor]}
+
+def page_projection(projection, sort_field):
+    # The sort key is always read so the next cursor can be built
+    if projection is None:
+        return None
+    return dict(projection, **{sort_field: 1})
+
+def split_page(docs, limit, sort_field):
+    # docs holds up to limit + 1 results; the extra one only signals another page
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        last = docs[-1]
+        next_cursor = encode_cursor(last[sort_field], last["_id"])
+    return docs, next_cursor
+
+def paginate(collection, query, sort_field, limit=None, cursor=None, projection=None):
+    limit = clamp_limit(limit)
+    
+    # Fetch one extra document to know whether another page exists
+    docs = list(
+        collection.find(keyset_query(query, sort_field, cursor), page_projection(projection, sort_field))
+        .sort([(sort_field, DESCENDING), ("_id", DESCENDING)])
+        .limit(limit + 1)
+    )
+    return split_page(docs, limit, sort_field)
+
+def text_search_pipeline(query, search_query, cursor=None, limit=None, projection=None):
+    # $text must lead the pipeline; results are ranked by relevance, then _id
+    pipeline = [
+        {"$match": dict(query, **{"$text": {"$search": search_query}})},
+        {"$addFields": {"score": {"$meta": "textScore"}}}
+    ]
+    if cursor:
+        pipeline.append({"$match": _after_cursor("score", cursor)})
+    pipeline.append({"$sort": {"score": DESCENDING, "_id": DESCENDING}})
+    if limit is not None:
+        pipeline.append({"$limit": limit})
+    if projection is not None:
+        pipeline.append({"$project": dict(projection, score=1)})
+    return pipeline
+
+def paginate_text_search(collection, query, search_query, limit=None, cursor=None, projection=None):
+    limit = clamp_limit(limit)
+    
+    pipeline = text_search_pipeline(query, search_query, cursor, limit + 1, projection)
+    docs = list(collection.aggregate(pipeline))
+    return split_page(docs, limit, "score")
\ No newline at end of file
@@ -0,0 +1,158 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from flask import current_app
+from backend.models.user_model import User
+from backend.utils.metrics import PASSWORD_HASH_WAIT, PASSWORD_HASH_DURATION, register_collector
+
+class PasswordHasherBusy(RuntimeError):
+    pass
+
+class PasswordHasher:
+    # Runs bcrypt on a small dedicated pool so a burst of logins cannot take
+    # every CPU from other requests. At most max_workers hashes run at once
+    # and at most max_queue more may wait; beyond that callers are rejected.
+    def __init__(self, rounds=12, max_workers=2, max_queue=32, timeout=10):
+        self.rounds = rounds
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bcrypt")
+        self.capacity = max_workers + max_queue
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.queue_time_total = 0.0
+        self.queue_time_max = 0.0
+        self.run_time_total = 0.0
+    
+    def hash(self, password):
+        return self._run("hash", User.hash_password, password, self.rounds)
+    
+    def verify(self, hashed_password, password):
+        # Returns (matches, needs_rehash)
+        matches = self._run("verify", User.check_password, hashed_password, password)
+        return matches, matches and User.password_rounds(hashed_password) < self.rounds
+    
+    async def hash_async(self, password):
+        # Same pool and limits, awaited instead of blocking the event loop
+        return await self._run_async("hash", User.hash_password, password, self.rounds)
+    
+    async def verify_async(self, hashed_password, password):
+        matches = await self._run_async("verify", User.check_password, hashed_password, password)
+        return matches, matches and User.password_rounds(hashed_password) < self.rounds
+    
+    def stats(self):
+        with self._lock:
+            return {
+                "in_flight": self.in_flight,
+                "capacity": self.capacity,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "queue_time_avg": self.queue_time_total / self.completed if self.completed else 0.0,
+                "queue_time_max": self.queue_time_max,
+                "run_time_avg": self.run_time_total / self.completed if self.completed else 0.0
+            }
+    
+    def _run(self, operation, fn, *args):
+        future = self._submit(operation, fn, *args)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise self._timed_out()
+    
+    async def _run_async(self, operation, fn, *args):
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(self._submit(operation, fn, *args)), self.timeout)
+        except asyncio.TimeoutError:
+            raise self._timed_out()
+    
+    def _timed_out(self):
+        # A slow pool is reported like a full one, so callers answer 503
+        with self._lock:
+            self.rejected += 1
+        return PasswordHasherBusy("Authentication is taking too long, please retry shortly")
+    
+    def _submit(self, operation, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise PasswordHasherBusy("Too many authentication requests, please retry shortly")
+        with self._lock:
+            self.in_flight += 1
+        
+        submitted_at = time.perf_counter()
+        
+        def timed():
+            started_at = time.perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                finished_at = time.perf_counter()
+                queue_time = started_at - submitted_at
+                PASSWORD_HASH_WAIT.observe(queue_time, operation)
+                PASSWORD_HASH_DURATION.observe(finished_at - started_at, operation)
+                with self._lock:
+                    self.completed += 1
+                    self.queue_time_total += queue_time
+                    self.queue_time_max = max(self.queue_time_max, queue_time)
+                    self.run_time_total += finished_at - started_at
+                self._release_slot()
+        
+        future = self._executor.submit(timed)
+        # A job cancelled before it started never runs timed(), which would
+        # otherwise release its slot
+        future.add_done_callback(lambda done: done.cancelled() and self._release_slot())
+        return future
+    
+    def _release_slot(self):
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+_hasher = None
+_hasher_pid = None
+_hasher_lock = threading.Lock()
+
+def get_password_hasher(config=None):
+    global _hasher, _hasher_pid
+    
+    # Threads do not survive fork, so each process builds its own pool
+    pid = os.getpid()
+    if _hasher is not None and _hasher_pid == pid:
+        return _hasher
+    
+    with _hasher_lock:
+        if _hasher is None or _hasher_pid != pid:
+            config = config if config is not None else current_app.config
+            _hasher = PasswordHasher(
+                rounds=config['BCRYPT_ROUNDS'],
+                max_workers=config['PASSWORD_HASH_WORKERS'],
+                max_queue=config['PASSWORD_HASH_QUEUE_SIZE'],
+                timeout=config['PASSWORD_HASH_TIMEOUT']
+            )
+            _hasher_pid = pid
+    return _hasher
+
+def _collect_hasher_metrics():
+    # Pool saturation of this process; nothing is reported before the first hash
+    hasher = _hasher if _hasher_pid == os.getpid() else None
+    if hasher is None:
+        return []
+    stats = hasher.stats()
+    return [
+        "# HELP password_hash_in_flight bcrypt jobs running or queued on the pool.",
+        "# TYPE password_hash_in_flight gauge",
+        f"password_hash_in_flight {stats['in_flight']}",
+        "# HELP password_hash_capacity bcrypt jobs the pool accepts before rejecting.",
+        "# TYPE password_hash_capacity gauge",
+        f"password_hash_capacity {stats['capacity']}",
+        "# HELP password_hash_rejected_total bcrypt jobs rejected because the pool was full or too slow.",
+        "# TYPE password_hash_rejected_total counter",
+        f"password_hash_rejected_total {stats['rejected']}"
+    ]
+
+register_collector(_collect_hasher_metrics)
\ No newline at end of file
@@ -0,0 +1,111 @@
+import csv
+import io
+import json
+import math
+from werkzeug.exceptions import RequestEntityTooLarge, ClientDisconnected
+
+IMPORT_FORMATS = {
+    "csv": ("text/csv", ".csv"),
+    "ndjson": ("application/x-ndjson", ".ndjson")
+}
+
+class ImportRowError(ValueError):
+    pass
+
+class ImportStreamError(ValueError):
+    # The upload cannot be read past this line (bad encoding, broken CSV,
+    # too large, client gone)
+    def __init__(self, line, message, status_code=200):
+        super().__init__(message)
+        self.line = line
+        self.status_code = status_code
+
+class ImportTooLarge(ValueError):
+    pass
+
+class SizeLimitedStream(io.RawIOBase):
+    # Raises ImportTooLarge once more than max_bytes have been read; covers
+    # chunked bodies, whose size is not known up front
+    def __init__(self, stream, max_bytes):
+        self.stream = stream
+        self.max_bytes = max_bytes
+        self.read_bytes = 0
+    
+    def readable(self):
+        return True
+    
+    def readinto(self, buffer):
+        data = self.stream.read(len(buffer))
+        self.read_bytes += len(data)
+        if self.read_bytes > self.max_bytes:
+            raise ImportTooLarge(f"Imports are limited to {self.max_bytes} bytes")
+        buffer[:len(data)] = data
+        return len(data)
+
+def detect_format(requested, mimetype=None, filename=None):
+    if requested:
+        return requested if requested in IMPORT_FORMATS else None
+    for import_format, (format_mimetype, extension) in IMPORT_FORMATS.items():
+        if mimetype == format_mimetype or (filename and filename.lower().endswith(extension)):
+            return import_format
+    if filename and filename.lower().endswith(".jsonl"):
+        return "ndjson"
+    return None
+
+def iter_import_rows(stream, import_format, max_bytes=None):
+    # Yields (line, row, error) one row at a time; the upload is decoded
+    # incrementally and never held in memory as a whole
+    if max_bytes is not None:
+        stream = io.BufferedReader(SizeLimitedStream(stream, max_bytes))
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    line = 0
+    try:
+        if import_format == "csv":
+            reader = csv.DictReader(text)
+            for row in reader:
+                line = reader.line_num
+                yield line, row, None
+        else:
+            for line, raw in enumerate(text, 1):
+                if not raw.strip():
+                    continue
+                try:
+                    yield line, json.loads(raw), None
+                except ValueError as e:
+                    yield line, None, f"Invalid JSON: {e}"
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise ImportStreamError(line + 1, str(e))
+    except (ImportTooLarge, RequestEntityTooLarge) as e:
+        raise ImportStreamError(line + 1, str(e) if isinstance(e, ImportTooLarge) else "Import is too large", 413)
+    except ClientDisconnected:
+        raise ImportStreamError(line + 1, "Client disconnected during upload", 400)
+    finally:
+        # Leave the underlying request stream to the server
+        text.detach()
+
+def validate_import_row(row):
+    if not isinstance(row, dict):
+        raise ImportRowError("Row must be an object")
+    if None in row:
+        raise ImportRowError("Row has more values than the header has columns")
+    
+    fields = {}
+    for name in ("title", "description", "category"):
+        value = row.get(name)
+        if not isinstance(value, str) or not value.strip():
+            raise ImportRowError(f"{name} is required")
+        fields[name] = value.strip()
+    
+    try:
+        price = float(row.get("price"))
+    except (TypeError, ValueError):
+        raise ImportRowError("price must be a number")
+    if not math.isfinite(price) or price < 0:
+        raise ImportRowError("price must be a non-negative number")
+    fields["price"] = price
+    
+    image_url = row.get("image_url") or ""
+    if not isinstance(image_url, str) or (image_url and not image_url.startswith(("http://", "https://", "/static/"))):
+        raise ImportRowError("image_url must be an http(s) URL")
+    fields["image_url"] = image_url
+    return fields
\ No newline at end of file
@@ -0,0 +1,164 @@
+import cProfile
+import hashlib
+import hmac
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+PROFILE_HEADER = "HTTP_X_PROFILE_TOKEN"
+
+def make_profile_token(secret, ttl=300):
+    # "<expires>:<signature>"; sent as the X-Profile-Token request header
+    expires = str(int(time.time()) + ttl)
+    signature = hmac.new(secret.encode("utf-8"), expires.encode("ascii"), hashlib.sha256).hexdigest()
+    return f"{expires}:{signature}"
+
+def verify_profile_token(secret, token):
+    expires, _, signature = token.partition(":")
+    if not expires.isdigit() or int(expires) < time.time():
+        return False
+    expected = hmac.new(secret.encode("utf-8"), expires.encode("ascii"), hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature)
+
+class StackSampler:
+    # Samples one thread's stack at a fixed interval and counts folded
+    # stacks ("outer;inner;leaf count"), the input format of flamegraph.pl
+    # and speedscope
+    def __init__(self, thread_id, interval=0.001):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+    
+    def start(self):
+        self._thread.start()
+    
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+    
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+    
+    def write(self, path):
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+class ProfilingMiddleware:
+    # WSGI middleware that profiles only requests carrying a valid signed
+    # X-Profile-Token header. Every other request pays one environ lookup.
+    # One profiled request runs at a time; others are served unprofiled.
+    def __init__(self, app, wsgi_app):
+        self.app = app
+        self.wsgi_app = wsgi_app
+        self._lock = threading.Lock()
+    
+    def __call__(self, environ, start_response):
+        token = environ.get(PROFILE_HEADER)
+        if token is None:
+            return self.wsgi_app(environ, start_response)
+        
+        config = self.app.config
+        if not verify_profile_token(config['PROFILING_SECRET'], token) or not self._lock.acquire(blocking=False):
+            return self.wsgi_app(environ, start_response)
+        try:
+            return self._profile(environ, start_response)
+        finally:
+            self._lock.release()
+    
+    def _profile(self, environ, start_response):
+        config = self.app.config
+        captured = {}
+        
+        def capture_start_response(status, headers, exc_info=None):
+            captured["status"] = status
+            captured["headers"] = headers
+            captured["exc_info"] = exc_info
+        
+        # The body is consumed inside the profile so streamed responses count
+        profiler_name = config['PROFILER']
+        started_at = time.perf_counter()
+        if profiler_name == "sampling":
+            profiler = StackSampler(threading.get_ident(), config['PROFILE_SAMPLE_INTERVAL'])
+            profiler.start()
+            try:
+                body = self._run(environ, capture_start_response)
+            finally:
+                profiler.stop()
+        else:
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                body = self._run(environ, capture_start_response)
+            finally:
+                profiler.disable()
+        duration_ms = (time.perf_counter() - started_at) * 1000
+        
+        profile_id = self._write(environ, profiler, profiler_name, captured["status"].split(" ", 1)[0], duration_ms)
+        headers = list(captured["headers"]) + [("X-Profile-Id", profile_id)]
+        start_response(captured["status"], headers, captured["exc_info"])
+        return [body]
+    
+    def _run(self, environ, start_response):
+        iterable = self.wsgi_app(environ, start_response)
+        try:
+            return b"".join(iterable)
+        finally:
+            if hasattr(iterable, "close"):
+                iterable.close()
+    
+    def _write(self, environ, profiler, profiler_name, status, duration_ms):
+        # Files are named <time>-<method>-<endpoint>-<duration>ms with a JSON
+        # sidecar holding the full request details
+        profile_dir = self.app.config['PROFILE_DIR']
+        os.makedirs(profile_dir, exist_ok=True)
+        endpoint = _endpoint(self.app, environ)
+        method = environ.get("REQUEST_METHOD", "GET")
+        profile_id = f"{datetime.utcnow():%Y%m%dT%H%M%S%f}-{method}-{re.sub(r'[^A-Za-z0-9_.-]', '_', endpoint)}-{duration_ms:.0f}ms"
+        base_path = os.path.join(profile_dir, profile_id)
+        
+        if profiler_name == "sampling":
+            output_path = base_path + ".collapsed"
+            profiler.write(output_path)
+        else:
+            output_path = base_path + ".pstats"
+            profiler.dump_stats(output_path)
+        
+        with open(base_path + ".json", "w") as f:
+            json.dump({
+                "method": method,
+                "path": environ.get("PATH_INFO"),
+                "query": environ.get("QUERY_STRING"),
+                "endpoint": endpoint,
+                "status": status,
+                "duration_ms": round(duration_ms, 3),
+                "profiler": profiler_name,
+                "output": os.path.basename(output_path),
+                "timestamp": datetime.utcnow().isoformat() + "Z"
+            }, f, indent=2)
+        return profile_id
+
+def _endpoint(app, environ):
+    try:
+        endpoint, _ = app.url_map.bind_to_environ(environ).match()
+        return endpoint
+    except Exception:
+        return "unmatched"
+
+def init_profiling(app):
+    app.wsgi_app = ProfilingMiddleware(app, app.wsgi_app)
\ No newline at end of file
@@ -0,0 +1,84 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app, request, jsonify
+
+class RateLimitStore:
+    # Interface for token-bucket storage. A shared store (e.g. Redis with a
+    # Lua script) implements consume() atomically for multi-process setups.
+    def consume(self, key, capacity, refill_rate, cost=1):
+        # Returns (allowed, retry_after_seconds)
+        raise NotImplementedError
+
+class MemoryRateLimitStore(RateLimitStore):
+    # Token buckets kept in an LRU map bounded to max_keys, so a flood of
+    # distinct addresses or emails cannot grow memory without limit
+    def __init__(self, max_keys=10000):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()  # key -> (tokens, updated_at)
+        self._lock = threading.Lock()
+    
+    def consume(self, key, capacity, refill_rate, cost=1):
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * refill_rate)
+            
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self._buckets[key] = (tokens, now)
+            
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        
+        retry_after = 0 if allowed else (cost - tokens) / refill_rate
+        return allowed, retry_after
+
+_store = None
+_store_lock = threading.Lock()
+
+def set_rate_limit_store(store):
+    global _store
+    with _store_lock:
+        _store = store
+
+def get_rate_limit_store(config=None):
+    global _store
+    if _store is not None:
+        return _store
+    
+    with _store_lock:
+        if _store is None:
+            config = config if config is not None else current_app.config
+            _store = MemoryRateLimitStore(max_keys=config['AUTH_RATE_LIMIT_MAX_KEYS'])
+    return _store
+
+def check_auth_rate_limit(config, remote_addr, data):
+    # Returns None when allowed, otherwise the whole seconds to wait
+    if not config['AUTH_RATE_LIMIT_ENABLED']:
+        return None
+    
+    store = get_rate_limit_store(config)
+    keys = [(f"ip:{remote_addr}", config['AUTH_RATE_LIMIT_IP_CAPACITY'], config['AUTH_RATE_LIMIT_IP_REFILL'])]
+    if isinstance(data, dict) and isinstance(data.get('email'), str):
+        email = data['email'].strip().lower()
+        keys.append((f"email:{email}", config['AUTH_RATE_LIMIT_EMAIL_CAPACITY'], config['AUTH_RATE_LIMIT_EMAIL_REFILL']))
+    
+    for key, capacity, refill_rate in keys:
+        allowed, retry_after = store.consume(key, capacity, refill_rate)
+        if not allowed:
+            return math.ceil(retry_after)
+    return None
+
+def limit_auth_requests():
+    # before_request hook: reject before any database lookup or hashing
+    retry_after = check_auth_rate_limit(current_app.config, request.remote_addr, request.get_json(silent=True))
+    if retry_after is None:
+        return None
+    
+    response = jsonify({"error": "Too many requests, please try again later"})
+    response.status_code = 429
+    response.headers['Retry-After'] = str(retry_after)
+    return response
\ No newline at end of file
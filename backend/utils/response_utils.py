@@ -0,0 +1,20 @@
+from flask import request, jsonify
+
+def conditional_response(result, status_code, private=False):
+    response = jsonify(result)
+    response.status_code = status_code
+    if status_code != 200:
+        return response
+    
+    # Strong ETag over the response body; a matching If-None-Match turns
+    # this into a bodyless 304
+    response.add_etag()
+    
+    # Clients must revalidate, and per-user data must not be shared by proxies
+    if private:
+        response.headers['Cache-Control'] = 'private, no-cache'
+        response.vary.add('Authorization')
+    else:
+        response.headers['Cache-Control'] = 'no-cache'
+    
+    return response.make_conditional(request)
\ No newline at end of file
@@ -0,0 +1,105 @@
+from slugify import slugify
+
+# Read path: turn raw BSON documents into response dicts directly, without
+# building model objects. Output matches the models' to_dict().
+
+def _id_str(value):
+    return str(value) if value is not None else None
+
+def _float(value):
+    return value if type(value) is float else float(value or 0)
+
+def _product_slug(doc):
+    slug = doc.get("slug")
+    return slug if slug is not None else slugify(doc.get("title") or "")
+
+# Per-field converters; a full document is every field in table order, a
+# sparse one only the fields the client asked for
+PRODUCT_FIELD_SERIALIZERS = {
+    "_id": lambda doc: str(doc["_id"]),
+    "title": lambda doc: doc.get("title"),
+    "description": lambda doc: doc.get("description"),
+    "category": lambda doc: doc.get("category"),
+    "price": lambda doc: _float(doc.get("price")),
+    "image_url": lambda doc: doc.get("image_url") or "",
+    "images": lambda doc: doc.get("images") or {},
+    "seller_id": lambda doc: _id_str(doc.get("seller_id")),
+    "created_at": lambda doc: doc.get("created_at"),
+    "updated_at": lambda doc: doc.get("updated_at"),
+    "slug": _product_slug
+}
+
+PURCHASE_FIELD_SERIALIZERS = {
+    "_id": lambda doc: str(doc["_id"]),
+    "user_id": lambda doc: str(doc["user_id"]),
+    "items": lambda doc: [serialize_purchase_item(item) for item in doc.get("items", ())],
+    "total_amount": lambda doc: _float(doc.get("total_amount")),
+    "purchase_date": lambda doc: doc.get("purchase_date")
+}
+
+# Flat CSV export columns; nested fields (images, purchase items) are left
+# out or spread over several rows
+PRODUCT_EXPORT_COLUMNS = ("_id", "title", "description", "category", "price", "image_url",
+                          "seller_id", "created_at", "updated_at", "slug")
+PURCHASE_EXPORT_COLUMNS = ("purchase_id", "purchase_date", "product_id", "title", "price", "quantity",
+                           "line_total", "order_total")
+
+def serialize_product(doc, fields=None):
+    if fields is None:
+        return {field: serialize(doc) for field, serialize in PRODUCT_FIELD_SERIALIZERS.items()}
+    return {field: PRODUCT_FIELD_SERIALIZERS[field](doc) for field in fields}
+
+def serialize_cart_item(doc):
+    return {
+        "_id": str(doc["_id"]),
+        "product_id": str(doc["product_id"]),
+        "quantity": doc.get("quantity"),
+        "added_at": doc.get("added_at")
+    }
+
+def serialize_cart(doc):
+    return {
+        "_id": str(doc["_id"]),
+        "user_id": str(doc["user_id"]),
+        "items": [serialize_cart_item(item) for item in doc.get("items", ())],
+        "created_at": doc.get("created_at"),
+        "updated_at": doc.get("updated_at")
+    }
+
+def serialize_purchase_item(doc):
+    return {
+        "_id": str(doc["_id"]),
+        "product_id": str(doc["product_id"]),
+        "title": doc.get("title"),
+        "price": _float(doc.get("price")),
+        "quantity": doc.get("quantity")
+    }
+
+def serialize_purchase(doc, fields=None):
+    if fields is None:
+        return {field: serialize(doc) for field, serialize in PURCHASE_FIELD_SERIALIZERS.items()}
+    return {field: PURCHASE_FIELD_SERIALIZERS[field](doc) for field in fields}
+
+def purchase_export_rows(purchase):
+    # One row per line item of a serialized purchase. line_total sums to the
+    # spend; order_total is only on the order's first row so it sums too
+    for index, item in enumerate(purchase["items"]):
+        yield {
+            "purchase_id": purchase["_id"],
+            "purchase_date": purchase["purchase_date"],
+            "product_id": item["product_id"],
+            "title": item["title"],
+            "price": item["price"],
+            "quantity": item["quantity"],
+            "line_total": round(item["price"] * item["quantity"], 2),
+            "order_total": purchase["total_amount"] if index == 0 else None
+        }
+
+def serialize_user(doc):
+    email = doc.get("email")
+    return {
+        "_id": str(doc["_id"]),
+        "email": email,
+        "username": doc.get("username") or email.split('@')[0],
+        "created_at": doc.get("created_at")
+    }
\ No newline at end of file
@@ -0,0 +1,229 @@
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from pymongo import MongoClient, monitoring
+from backend.utils.indexes import _plan_stages
+
+# Commands whose filter and sort are worth recording and can be explained
+EXPLAINABLE = {"find", "aggregate", "count", "distinct", "findAndModify", "update", "delete"}
+
+# Session and cluster fields the driver adds; explain rejects some of them
+DRIVER_FIELDS = {
+    "lsid", "$clusterTime", "$db", "txnNumber", "autocommit", "startTransaction",
+    "$readPreference", "readConcern", "writeConcern", "apiVersion", "apiStrict", "apiDeprecationErrors"
+}
+
+CONTROLLER_PACKAGES = (
+    os.path.join("backend", "controllers") + os.sep,
+    os.path.join("backend", "aio", "controllers") + os.sep
+)
+
+# Operators whose array holds clauses, not values; each clause is shape
+LOGICAL_OPERATORS = {"$or", "$and", "$nor"}
+
+def redact(value):
+    # Keep field names and operators, replace every value with "?"; value
+    # arrays ($in, $all, ...) collapse to one element
+    if isinstance(value, dict):
+        redacted = {}
+        for key, item in value.items():
+            if key in LOGICAL_OPERATORS and isinstance(item, (list, tuple)):
+                redacted[key] = [redact(clause) for clause in item]
+            else:
+                redacted[key] = redact(item)
+        return redacted
+    if isinstance(value, (list, tuple)):
+        return [redact(item) for item in value[:1]]
+    return "?"
+
+# $lookup and $unionWith options that name collections and fields
+LOOKUP_NAMES = {"from", "localField", "foreignField", "as", "coll"}
+
+def _redact_nested(spec):
+    # Keep the collection and field names, redact the sub-pipeline stage by stage
+    redacted = {}
+    for key, value in spec.items():
+        if key == "pipeline":
+            redacted[key] = _redact_pipeline(value)
+        elif key in LOOKUP_NAMES:
+            redacted[key] = value
+        else:
+            redacted[key] = redact(value)
+    return redacted
+
+def _redact_pipeline(pipeline):
+    # Stage layout is kept; sorts and limits are shape, not data
+    stages = []
+    for stage in pipeline or ():
+        name = next(iter(stage), None)
+        body = stage.get(name)
+        if name in ("$sort", "$limit", "$project", "$addFields"):
+            stages.append(stage)
+        elif name == "$facet" and isinstance(body, dict):
+            stages.append({name: {facet: _redact_pipeline(sub_pipeline) for facet, sub_pipeline in body.items()}})
+        elif name in ("$lookup", "$unionWith") and isinstance(body, dict):
+            stages.append({name: _redact_nested(body)})
+        elif name == "$unionWith" and isinstance(body, str):
+            stages.append(stage)
+        else:
+            stages.append({name: redact(body)})
+    return stages
+
+def query_shape(command_name, command):
+    if command_name == "find":
+        return {"filter": redact(command.get("filter", {})), "sort": command.get("sort")}
+    if command_name == "aggregate":
+        return {"pipeline": _redact_pipeline(command.get("pipeline"))}
+    if command_name == "findAndModify":
+        return {"filter": redact(command.get("query", {})), "sort": command.get("sort")}
+    if command_name in ("count", "distinct"):
+        return {"filter": redact(command.get("query", {}))}
+    if command_name in ("update", "delete"):
+        statements = command.get("updates" if command_name == "update" else "deletes") or [{}]
+        return {"filter": redact(statements[0].get("q", {})), "statements": len(statements)}
+    return {}
+
+def calling_controller():
+    # Innermost frame that belongs to a controller module
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if any(package in filename for package in CONTROLLER_PACKAGES):
+            module = os.path.splitext(os.path.basename(filename))[0]
+            return f"{module}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return None
+
+class SlowQueryLog(monitoring.CommandListener):
+    # Records commands slower than threshold_ms with the calling controller,
+    # the redacted filter and sort shape and the explain() winning plan.
+    # Explain runs on a background thread with its own client so the
+    # request that ran the slow command is not slowed further.
+    def __init__(self, config):
+        self.threshold_micros = config['SLOW_QUERY_THRESHOLD_MS'] * 1000
+        self.explain = config['SLOW_QUERY_EXPLAIN']
+        self.mongo_uri = config['MONGO_URI']
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._client = None
+        self._client_pid = None
+        self._queue = queue.Queue(maxsize=100)
+        self._worker = None
+        
+        self.logger = logging.getLogger("ecofinds.slow_queries")
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        if not self.logger.handlers:
+            log_file = config['SLOW_QUERY_LOG_FILE']
+            os.makedirs(os.path.dirname(os.path.abspath(log_file)), exist_ok=True)
+            self.logger.addHandler(RotatingFileHandler(
+                log_file, maxBytes=config['SLOW_QUERY_LOG_MAX_BYTES'], backupCount=config['SLOW_QUERY_LOG_BACKUPS']
+            ))
+    
+    def started(self, event):
+        if event.command_name not in EXPLAINABLE:
+            return
+        with self._lock:
+            self._pending[(event.connection_id, event.request_id)] = (event.database_name, event.command)
+    
+    def succeeded(self, event):
+        self._finish(event, "success")
+    
+    def failed(self, event):
+        self._finish(event, "failure")
+    
+    def _finish(self, event, outcome):
+        if event.command_name not in EXPLAINABLE:
+            return
+        with self._lock:
+            pending = self._pending.pop((event.connection_id, event.request_id), None)
+        if pending is None or event.duration_micros < self.threshold_micros:
+            return
+        
+        database_name, command = pending
+        collection = command.get(event.command_name)
+        record = {
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "duration_ms": round(event.duration_micros / 1000, 3),
+            "outcome": outcome,
+            "controller": calling_controller(),
+            "database": database_name,
+            "collection": collection if isinstance(collection, str) else None,
+            "command": event.command_name,
+            "shape": query_shape(event.command_name, command)
+        }
+        if not self.explain:
+            self._write(record)
+            return
+        try:
+            self._queue.put_nowait((record, database_name, command))
+        except queue.Full:
+            record["plan_error"] = "explain queue full"
+            self._write(record)
+            return
+        self._ensure_worker()
+    
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            with self._lock:
+                if self._worker is None or not self._worker.is_alive():
+                    self._worker = threading.Thread(target=self._explain_loop, name="slow-query-explain", daemon=True)
+                    self._worker.start()
+    
+    def _explain_loop(self):
+        while True:
+            record, database_name, command = self._queue.get()
+            try:
+                explained = self._run_explain(database_name, command)
+                winning_plan = _find_winning_plan(explained)
+                record["plan"] = winning_plan
+                record["plan_stages"] = _plan_stages(winning_plan)
+            except Exception as e:
+                record["plan_error"] = str(e)
+            self._write(record)
+    
+    def _run_explain(self, database_name, command):
+        if self._client is None or self._client_pid != os.getpid():
+            # No listeners on this client, so explains are never logged themselves
+            self._client = MongoClient(self.mongo_uri, serverSelectionTimeoutMS=5000)
+            self._client_pid = os.getpid()
+        explainable = {key: value for key, value in command.items() if key not in DRIVER_FIELDS}
+        return self._client[database_name].command({"explain": explainable, "verbosity": "queryPlanner"})
+    
+    def _write(self, record):
+        self.logger.info(json.dumps(record, default=str))
+
+def _find_winning_plan(explained):
+    # find/count put queryPlanner at the top; aggregate nests it in a stage
+    if isinstance(explained, dict):
+        planner = explained.get("queryPlanner")
+        if isinstance(planner, dict) and "winningPlan" in planner:
+            return planner["winningPlan"]
+        for value in explained.values():
+            plan = _find_winning_plan(value)
+            if plan is not None:
+                return plan
+    elif isinstance(explained, list):
+        for value in explained:
+            plan = _find_winning_plan(value)
+            if plan is not None:
+                return plan
+    return None
+
+_slow_query_log = None
+_slow_query_lock = threading.Lock()
+
+def get_slow_query_log(config):
+    global _slow_query_log
+    if _slow_query_log is not None:
+        return _slow_query_log
+    
+    with _slow_query_lock:
+        if _slow_query_log is None:
+            _slow_query_log = SlowQueryLog(config)
+    return _slow_query_log
\ No newline at end of file
@@ -0,0 +1,145 @@
+import hashlib
+import os
+import tempfile
+import threading
+from datetime import datetime
+from flask import current_app
+from pymongo import ReturnDocument
+
+class UploadTooLarge(ValueError):
+    pass
+
+class LocalFileStore:
+    # Content-addressed file store: every file is named after the SHA-256 of
+    # its bytes, so identical uploads share one file on disk
+    def __init__(self, root, url_prefix="/static/uploads", max_size=10 * 1024 * 1024, chunk_size=64 * 1024):
+        self.root = root
+        self.url_prefix = url_prefix
+        self.max_size = max_size
+        self.chunk_size = chunk_size
+    
+    def path(self, filename):
+        return os.path.join(self.root, filename)
+    
+    def url(self, filename):
+        return f"{self.url_prefix}/{filename}"
+    
+    def exists(self, filename):
+        return os.path.exists(self.path(filename))
+    
+    def write_stream(self, stream, extension):
+        # Copy the stream to a temporary file chunk by chunk, hashing as we go.
+        # The caller takes a reference on the digest and then calls keep() or
+        # discard(), so a concurrent release cannot delete the file in between
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix=".upload-")
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                while True:
+                    chunk = stream.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if size > self.max_size:
+                        raise UploadTooLarge(f"Image exceeds the maximum size of {self.max_size} bytes")
+                    digest.update(chunk)
+                    tmp_file.write(chunk)
+            return digest.hexdigest(), f"{digest.hexdigest()}.{extension}", tmp_path
+        except BaseException:
+            self.discard(tmp_path)
+            raise
+    
+    def keep(self, tmp_path, filename):
+        # Identical bytes may already be in place; either copy will do
+        if self.exists(filename):
+            self.discard(tmp_path)
+        else:
+            os.replace(tmp_path, self.path(filename))
+    
+    def discard(self, tmp_path):
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+    
+    def retire(self, filenames):
+        # Move files aside under a temporary name; restore() or purge() them
+        retired = []
+        for filename in filenames:
+            tombstone = self.path(f".retired-{os.getpid()}-{threading.get_ident()}-{filename}")
+            try:
+                os.replace(self.path(filename), tombstone)
+            except FileNotFoundError:
+                continue
+            retired.append((filename, tombstone))
+        return retired
+    
+    def restore(self, retired):
+        for filename, tombstone in retired:
+            os.replace(tombstone, self.path(filename))
+    
+    def purge(self, retired):
+        for _, tombstone in retired:
+            self.discard(tombstone)
+    
+    def delete(self, filenames):
+        for filename in filenames:
+            try:
+                os.remove(self.path(filename))
+            except FileNotFoundError:
+                pass
+
+# Reference counts live in the 'uploads' collection, keyed by digest, so
+# every worker process agrees on when a file is no longer used
+def acquire_upload(db, digest, filename):
+    return db.uploads.find_one_and_update(
+        {"_id": digest},
+        {"$inc": {"refs": 1}, "$setOnInsert": {"filename": filename, "created_at": datetime.utcnow()}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+
+def release_upload(db, store, digest):
+    record = db.uploads.find_one_and_update(
+        {"_id": digest},
+        {"$inc": {"refs": -1}},
+        return_document=ReturnDocument.AFTER
+    )
+    if not record or record["refs"] > 0:
+        return False
+    
+    # Only the caller that removes the record deletes the files. An upload of
+    # the same bytes may re-create the record meanwhile; its files are then
+    # put back instead of deleted
+    if db.uploads.delete_one({"_id": digest, "refs": {"$lte": 0}}).deleted_count:
+        retired = store.retire([record["filename"]] + list(record.get("renditions", {}).values()))
+        if db.uploads.find_one({"_id": digest}, {"_id": 1}):
+            store.restore(retired)
+        else:
+            store.purge(retired)
+        return True
+    return False
+
+_store = None
+_store_lock = threading.Lock()
+
+def set_file_store(store):
+    global _store
+    with _store_lock:
+        _store = store
+
+def get_file_store():
+    global _store
+    if _store is not None:
+        return _store
+    
+    with _store_lock:
+        if _store is None:
+            config = current_app.config
+            _store = LocalFileStore(
+                config['UPLOAD_FOLDER'],
+                max_size=config['MAX_IMAGE_SIZE'],
+                chunk_size=config['UPLOAD_CHUNK_SIZE']
+            )
+    return _store
\ No newline at end of file
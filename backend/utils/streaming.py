@@ -0,0 +1,132 @@
+import csv
+import io
+import zlib
+from flask import Response, current_app, stream_with_context
+from backend.utils.json_provider import _default
+
+STREAM_FORMATS = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson"
+}
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", ".csv"),
+    "ndjson": ("application/x-ndjson", ".ndjson")
+}
+
+def iter_serialized(cursor, serialize, fields=None):
+    # Serialize documents one at a time as the driver fetches batches, and
+    # close the server cursor if the client goes away mid-stream
+    try:
+        for doc in cursor:
+            yield serialize(doc, fields)
+    finally:
+        cursor.close()
+
+def iter_flattened(items, flatten):
+    # One item may become several rows (a purchase per line item)
+    try:
+        for item in items:
+            yield from flatten(item)
+    finally:
+        items.close()
+
+def _chunked(parts, chunk_size):
+    # Group small writes so the server is not flushed once per document
+    buffer = []
+    size = 0
+    for part in parts:
+        buffer.append(part)
+        size += len(part)
+        if size >= chunk_size:
+            yield "".join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield "".join(buffer)
+
+def _json_array_parts(items, key, dumps):
+    yield '{"' + key + '":['
+    separator = ""
+    for item in items:
+        yield separator + dumps(item, compact=True)
+        separator = ","
+    yield "]}"
+
+def _ndjson_parts(items, dumps):
+    for item in items:
+        yield dumps(item, compact=True) + "\n"
+
+def stream_response(items, key, stream_format):
+    # Body is either {"<key>": [...]} written element by element, or one JSON
+    # document per line; memory use does not depend on the number of items
+    dumps = current_app.json.dumps
+    if stream_format == "ndjson":
+        parts = _ndjson_parts(items, dumps)
+    else:
+        parts = _json_array_parts(items, key, dumps)
+    
+    chunks = _chunked(parts, current_app.config['STREAM_CHUNK_SIZE'])
+    return Response(stream_with_context(chunks), mimetype=STREAM_FORMATS[stream_format])
+
+def csv_line_encoder(columns):
+    # Encodes one row dict per call into a CSV line, reusing a single buffer
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    
+    def encode(row):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow([_csv_value(row.get(column)) for column in columns])
+        return buffer.getvalue()
+    return encode
+
+# Leading characters a spreadsheet would read as the start of a formula
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+def _csv_value(value):
+    # Dates, ids and decimals are written as they appear in the JSON API;
+    # text that would be evaluated as a formula is quoted with a leading '
+    if isinstance(value, str):
+        return "'" + value if value.startswith(FORMULA_PREFIXES) else value
+    if value is None or isinstance(value, (int, float)):
+        return value
+    return _default(value)
+
+def _csv_parts(rows, columns):
+    encode = csv_line_encoder(columns)
+    yield encode(dict(zip(columns, columns)))
+    for row in rows:
+        yield encode(row)
+
+def gzip_compressor():
+    return zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+def _gzipped(chunks):
+    # Flushed per chunk so the client receives data as soon as it is read
+    compressor = gzip_compressor()
+    for chunk in chunks:
+        yield compressor.compress(chunk.encode("utf-8")) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+def export_attachment(name, export_format, compress):
+    mimetype, extension = EXPORT_FORMATS[export_format]
+    if compress:
+        return "application/gzip", f'attachment; filename="{name}{extension}.gz"'
+    return mimetype, f'attachment; filename="{name}{extension}"'
+
+def export_response(rows, export_format, name, columns=None, compress=False):
+    # A file download written row by row from the cursor: CSV with a header
+    # line, or one JSON document per line; optionally gzip-compressed
+    if export_format == "csv":
+        parts = _csv_parts(rows, columns)
+    else:
+        parts = _ndjson_parts(rows, current_app.json.dumps)
+    
+    chunks = _chunked(parts, current_app.config['STREAM_CHUNK_SIZE'])
+    if compress:
+        chunks = _gzipped(chunks)
+    mimetype, disposition = export_attachment(name, export_format, compress)
+    response = Response(stream_with_context(chunks), mimetype=mimetype)
+    response.headers["Content-Disposition"] = disposition
+    return response
\ No newline at end of file
@@ -0,0 +1,60 @@
+# Compare Flask's default JSON provider with FastJSONProvider on a product
+# listing payload.
+#
+#   python benchmarks/json_provider_bench.py [product_count] [repeat]
+import os
+import sys
+import timeit
+from datetime import datetime, timedelta
+from bson import ObjectId
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.utils.json_provider import FastJSONProvider
+from backend.utils.serializers import serialize_product
+
+def make_listing(count):
+    now = datetime.utcnow()
+    seller_id = ObjectId()
+    products = []
+    for i in range(count):
+        products.append(serialize_product({
+            "_id": ObjectId(),
+            "title": f"Reclaimed oak side table {i}",
+            "description": "Hand-finished side table made from reclaimed oak. " * 4,
+            "category": "furniture",
+            "price": 49.5 + i,
+            "image_url": f"/static/uploads/{i:064x}_detail.webp",
+            "images": {
+                "thumbnail": f"/static/uploads/{i:064x}_thumbnail.webp",
+                "card": f"/static/uploads/{i:064x}_card.webp",
+                "detail": f"/static/uploads/{i:064x}_detail.webp"
+            },
+            "seller_id": seller_id,
+            "created_at": now - timedelta(minutes=i),
+            "updated_at": now - timedelta(minutes=i),
+            "slug": f"reclaimed-oak-side-table-{i}"
+        }))
+    return {"products": products, "next_cursor": None}
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    payload = make_listing(count)
+    
+    app = Flask(__name__)
+    providers = [("default", DefaultJSONProvider(app)), ("fast", FastJSONProvider(app))]
+    
+    print(f"Product listing with {count} products, best of 5 x {repeat} runs")
+    baseline = None
+    with app.app_context():
+        for name, provider in providers:
+            size = len(provider.response(payload).get_data())
+            best = min(timeit.repeat(lambda: provider.response(payload).get_data(), number=repeat, repeat=5)) / repeat
+            baseline = baseline or best
+            print(f"{name:<8} {best * 1000:8.2f} ms/response  {size / 1024:8.1f} KiB  {baseline / best:5.1f}x")
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
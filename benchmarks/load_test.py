@@ -0,0 +1,429 @@
+# Load test for the API: seeds a dedicated database with synthetic users,
+# products, carts and purchases, drives each endpoint at a fixed
+# concurrency and reports throughput and p50/p95/p99 latency.
+#
+#   # against a running server (WSGI or ASGI) using MONGO_URI=.../ecofinds_bench
+#   # and AUTH_RATE_LIMIT_ENABLED=false
+#   python benchmarks/load_test.py --base-url http://localhost:5000
+#
+#   # in-process against the Flask app with an in-memory MongoDB (mongomock)
+#   python benchmarks/load_test.py --in-memory
+#
+#   # compare with a stored baseline; exits 1 on regression
+#   python benchmarks/load_test.py --in-memory --baseline benchmarks/results/baseline.json
+#
+# The seed is deterministic (--seed), every run writes a JSON result file,
+# and any result file can be used as a baseline for a later run.
+import argparse
+import http.client
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit
+from bson import ObjectId
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+CATEGORIES = ["clothing", "electronics", "furniture", "books", "other"]
+WORDS = ["vintage", "oak", "table", "linen", "shirt", "laptop", "novel", "lamp", "wool", "chair",
+         "leather", "jacket", "camera", "poster", "bicycle", "ceramic", "vase", "desk", "denim", "radio"]
+PASSWORD = "benchmark-password"
+
+# Synthetic data
+
+def seed(db, users=50, products=2000, cart_items=3, purchases=10, rng_seed=42, password_rounds=12):
+    # Replaces the contents of the benchmark database with a fixed data set
+    from backend.models.user_model import User
+    from backend.models.cart_model import CartItem
+    from backend.models.purchase_model import PurchaseItem
+    
+    rng = random.Random(rng_seed)
+    now = datetime.utcnow().replace(microsecond=0)
+    for collection_name in ("users", "products", "carts", "purchases", "uploads"):
+        db[collection_name].delete_many({})
+    
+    # One hash shared by every user keeps seeding fast; logins still verify it
+    hashed_password = User.hash_password(PASSWORD, password_rounds)
+    user_docs = [{
+        "_id": ObjectId(),
+        "email": f"bench-user-{i}@example.com",
+        "password": hashed_password,
+        "username": f"bench-user-{i}",
+        "created_at": now - timedelta(days=i)
+    } for i in range(users)]
+    db.users.insert_many(user_docs)
+    
+    product_docs = []
+    for i in range(products):
+        title = " ".join(rng.sample(WORDS, 3)).title()
+        created_at = now - timedelta(minutes=i)
+        product_docs.append({
+            "_id": ObjectId(),
+            "title": title,
+            "description": " ".join(rng.choice(WORDS) for _ in range(30)),
+            "category": rng.choice(CATEGORIES),
+            "price": round(rng.uniform(1, 500), 2),
+            "image_url": "",
+            "images": {},
+            "image_hash": None,
+            "seller_id": rng.choice(user_docs)["_id"],
+            "created_at": created_at,
+            "updated_at": created_at,
+            "slug": title.lower().replace(" ", "-")
+        })
+    db.products.insert_many(product_docs)
+    
+    cart_docs = []
+    purchase_docs = []
+    for user_doc in user_docs:
+        items = [CartItem(product_doc["_id"], rng.randint(1, 3), added_at=now).to_dict()
+                 for product_doc in rng.sample(product_docs, cart_items)]
+        cart_docs.append({"user_id": user_doc["_id"], "items": items, "created_at": now, "updated_at": now})
+        
+        for j in range(purchases):
+            purchase_items = [
+                PurchaseItem(product_doc["_id"], product_doc["title"], product_doc["price"], rng.randint(1, 3)).to_dict()
+                for product_doc in rng.sample(product_docs, rng.randint(1, 4))
+            ]
+            purchase_docs.append({
+                "user_id": user_doc["_id"],
+                "items": purchase_items,
+                "total_amount": sum(item["price"] * item["quantity"] for item in purchase_items),
+                "purchase_date": now - timedelta(days=j, minutes=rng.randint(0, 1440))
+            })
+    db.carts.insert_many(cart_docs)
+    if purchase_docs:
+        db.purchases.insert_many(purchase_docs)
+    
+    return {"users": users, "products": products, "cart_items": cart_items, "purchases": len(purchase_docs)}
+
+def mint_tokens(config, user_ids):
+    # Tokens are signed with the server's secret, so no login is needed to set up
+    from flask import Flask
+    from flask_jwt_extended import JWTManager, create_access_token
+    
+    app = Flask(__name__)
+    app.config.from_mapping(config)
+    JWTManager(app)
+    with app.app_context():
+        return [create_access_token(identity=str(user_id)) for user_id in user_ids]
+
+# Clients
+
+class HttpClient:
+    # One keep-alive connection per thread
+    def __init__(self, base_url):
+        parts = urlsplit(base_url)
+        self.connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        self.netloc = parts.netloc
+        self.prefix = parts.path.rstrip("/")
+        self._local = threading.local()
+    
+    def request(self, method, path, body=None, headers=None):
+        headers = dict(headers or {})
+        data = None
+        if body is not None:
+            data = json.dumps(body).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        
+        for attempt in range(2):
+            connection = getattr(self._local, "connection", None)
+            if connection is None:
+                connection = self._local.connection = self.connection_class(self.netloc, timeout=30)
+            try:
+                connection.request(method, self.prefix + path, body=data, headers=headers)
+                response = connection.getresponse()
+                response.read()
+                return response.status
+            except (http.client.HTTPException, ConnectionError):
+                # The server closed an idle keep-alive connection; reconnect once
+                connection.close()
+                self._local.connection = None
+                if attempt:
+                    raise
+
+class InProcessClient:
+    # Flask test client per thread; no network or server process involved
+    def __init__(self, app):
+        self.app = app
+        self._local = threading.local()
+    
+    def request(self, method, path, body=None, headers=None):
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        response = client.open(path, method=method, json=body, headers=headers)
+        response.close()
+        return response.status_code
+
+# Scenarios: each returns the timed request; prepare runs untimed before it
+
+class Worker:
+    def __init__(self, index, user_id, token, product_ids, rng_seed):
+        self.index = index
+        self.user_id = user_id
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.product_ids = product_ids
+        self.rng = random.Random(rng_seed * 1000 + index)
+        self.cart_product_id = None
+    
+    def product_id(self):
+        return self.rng.choice(self.product_ids)
+
+def _add_to_cart(client, worker, product_id):
+    client.request("POST", "/api/cart/add", {"product_id": product_id, "quantity": 1}, worker.headers)
+
+def _prepare_cart_update(client, worker):
+    if worker.cart_product_id is None:
+        worker.cart_product_id = worker.product_id()
+        _add_to_cart(client, worker, worker.cart_product_id)
+
+def _prepare_cart_remove(client, worker):
+    worker.cart_product_id = worker.product_id()
+    _add_to_cart(client, worker, worker.cart_product_id)
+
+def _prepare_checkout(client, worker):
+    _add_to_cart(client, worker, worker.product_id())
+
+SCENARIOS = {
+    "products_list": (None, lambda w: ("GET", "/api/products/?limit=24", None, None)),
+    "products_category": (None, lambda w: ("GET", f"/api/products/?category={w.rng.choice(CATEGORIES)}&limit=24", None, None)),
+    "products_fields": (None, lambda w: ("GET", "/api/products/?limit=24&fields=title,price,category,image_url,images", None, None)),
+    "products_search": (None, lambda w: ("GET", f"/api/products/?search={w.rng.choice(WORDS)}&limit=24", None, None)),
+    "product_detail": (None, lambda w: ("GET", f"/api/products/{w.product_id()}", None, None)),
+    "cart_get": (None, lambda w: ("GET", "/api/cart/", None, w.headers)),
+    "cart_add": (None, lambda w: ("POST", "/api/cart/add", {"product_id": w.product_id(), "quantity": 1}, w.headers)),
+    "cart_update": (_prepare_cart_update, lambda w: (
+        "PUT", f"/api/cart/update/{w.cart_product_id}", {"quantity": w.rng.randint(1, 5)}, w.headers
+    )),
+    "cart_remove": (_prepare_cart_remove, lambda w: ("DELETE", f"/api/cart/remove/{w.cart_product_id}", None, w.headers)),
+    "checkout": (_prepare_checkout, lambda w: ("POST", "/api/cart/checkout", None, w.headers)),
+    "auth_login": (None, lambda w: (
+        "POST", "/api/auth/login", {"email": f"bench-user-{w.index}@example.com", "password": PASSWORD}, None
+    ))
+}
+
+# Measurement
+
+def percentile(sorted_values, p):
+    # Nearest-rank percentile
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+def run_scenario(client, workers, scenario, requests, warmup):
+    prepare, build = scenario
+    per_worker = max(1, requests // len(workers))
+    
+    def drive(worker, count, timed):
+        latencies = []
+        errors = 0
+        for _ in range(count):
+            if prepare:
+                prepare(client, worker)
+            method, path, body, headers = build(worker)
+            started_at = time.perf_counter()
+            try:
+                status = client.request(method, path, body, headers)
+            except Exception:
+                status = None
+            latency = time.perf_counter() - started_at
+            if timed:
+                latencies.append(latency)
+                if status is None or status >= 400:
+                    errors += 1
+        return latencies, errors
+    
+    with ThreadPoolExecutor(max_workers=len(workers)) as executor:
+        list(executor.map(lambda w: drive(w, warmup, False), workers))
+        
+        started_at = time.perf_counter()
+        results = list(executor.map(lambda w: drive(w, per_worker, True), workers))
+        elapsed = time.perf_counter() - started_at
+    
+    latencies = sorted(latency for worker_latencies, _ in results for latency in worker_latencies)
+    errors = sum(worker_errors for _, worker_errors in results)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "duration_s": round(elapsed, 4),
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3)
+    }
+
+def compare(results, baseline, threshold):
+    # A regression is throughput down or p95 up by more than threshold
+    regressions = []
+    for name, current in results["endpoints"].items():
+        previous = baseline.get("endpoints", {}).get(name)
+        if not previous:
+            continue
+        if previous["throughput_rps"] and current["throughput_rps"] < previous["throughput_rps"] * (1 - threshold):
+            regressions.append(f"{name}: throughput {previous['throughput_rps']} -> {current['throughput_rps']} rps")
+        if previous["p95_ms"] and current["p95_ms"] > previous["p95_ms"] * (1 + threshold):
+            regressions.append(f"{name}: p95 {previous['p95_ms']} -> {current['p95_ms']} ms")
+    return regressions
+
+def print_report(results, baseline=None):
+    print(f"{'endpoint':<18} {'reqs':>6} {'errs':>5} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'vs base':>8}")
+    for name, stats in results["endpoints"].items():
+        change = ""
+        previous = (baseline or {}).get("endpoints", {}).get(name)
+        if previous and previous["throughput_rps"]:
+            change = f"{(stats['throughput_rps'] / previous['throughput_rps'] - 1) * 100:+.1f}%"
+        print(f"{name:<18} {stats['requests']:>6} {stats['errors']:>5} {stats['throughput_rps']:>9.1f} "
+              f"{stats['p50_ms']:>9.2f} {stats['p95_ms']:>9.2f} {stats['p99_ms']:>9.2f} {change:>8}")
+
+def _git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+# Setup
+
+def in_memory_target():
+    # The Flask app on mongomock, imported with rate limiting disabled
+    try:
+        import mongomock
+    except ImportError:
+        sys.exit("--in-memory needs mongomock: pip install mongomock")
+    os.environ['AUTH_RATE_LIMIT_ENABLED'] = 'false'
+    
+    import backend.utils.db
+    backend.utils.db.MongoClient = mongomock.MongoClient
+    from app import app
+    from backend.utils.db import get_db
+    return InProcessClient(app), get_db(app.config), app.config
+
+def server_target(base_url, mongo_uri):
+    from pymongo import MongoClient
+    from config import Config
+    from backend.utils.indexes import ensure_indexes
+    
+    db = MongoClient(mongo_uri).get_database()
+    ensure_indexes(db)
+    config = {key: getattr(Config, key) for key in dir(Config) if key.isupper()}
+    return HttpClient(base_url), db, config
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed a benchmark database and load-test the API")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--base-url", help="server to test, e.g. http://localhost:5000")
+    target.add_argument("--in-memory", action="store_true", help="test the Flask app in-process on mongomock")
+    parser.add_argument("--mongo-uri", default=os.environ.get("BENCH_MONGO_URI", "mongodb://localhost:27017/ecofinds_bench"),
+                        help="database the server under test uses; its contents are replaced")
+    parser.add_argument("--endpoints", default=",".join(SCENARIOS), help="comma-separated scenarios to run")
+    parser.add_argument("--concurrency", type=int,
+                        help="parallel workers (default 8; 1 with --in-memory, since mongomock is not thread-safe)")
+    parser.add_argument("--requests", type=int, default=400, help="timed requests per endpoint")
+    parser.add_argument("--warmup", type=int, default=5, help="untimed requests per worker before timing")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--products", type=int, default=2000)
+    parser.add_argument("--cart-items", type=int, default=3)
+    parser.add_argument("--purchases", type=int, default=10, help="purchases per user")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--skip-seed", action="store_true", help="reuse the data set from a previous run")
+    parser.add_argument("--output", help="result file (default benchmarks/results/<target>-<time>.json)")
+    parser.add_argument("--baseline", help="result file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed relative regression")
+    args = parser.parse_args()
+    
+    if args.concurrency is None:
+        args.concurrency = 1 if args.in_memory else 8
+    
+    if args.in_memory:
+        client, db, config = in_memory_target()
+        target_name = "in-memory"
+    else:
+        client, db, config = server_target(args.base_url or "http://localhost:5000", args.mongo_uri)
+        target_name = args.base_url or "http://localhost:5000"
+    
+    if args.concurrency > args.users:
+        sys.exit("--concurrency cannot exceed --users; each worker acts as its own user")
+    
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        # Numbers from another target or concurrency are not comparable
+        previous = (baseline.get("target"), baseline.get("settings", {}).get("concurrency"))
+        if previous != (target_name, args.concurrency):
+            sys.exit(f"Baseline was recorded against {previous[0]} at concurrency {previous[1]}; "
+                     f"this run is {target_name} at concurrency {args.concurrency}")
+    
+    dataset = None
+    if not args.skip_seed:
+        started_at = time.perf_counter()
+        dataset = seed(db, args.users, args.products, args.cart_items, args.purchases, args.seed,
+                       config.get('BCRYPT_ROUNDS', 12))
+        print(f"Seeded {dataset} in {time.perf_counter() - started_at:.1f}s")
+    
+    user_ids = [doc["_id"] for doc in db.users.find(
+        {"email": {"$regex": "^bench-user-"}}, {"_id": 1}
+    ).sort("created_at", -1).limit(args.concurrency)]
+    product_ids = [str(doc["_id"]) for doc in db.products.find({}, {"_id": 1}).sort("_id", 1)]
+    if len(user_ids) < args.concurrency or not product_ids:
+        sys.exit("Benchmark data set not found; run without --skip-seed")
+    tokens = mint_tokens(config, user_ids)
+    
+    names = [name.strip() for name in args.endpoints.split(",") if name.strip()]
+    if args.in_memory and "products_search" in names:
+        # mongomock does not implement $text
+        names.remove("products_search")
+    
+    results = {
+        "target": target_name,
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "settings": {
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "seed": args.seed,
+            "dataset": dataset or "reused"
+        },
+        "endpoints": {}
+    }
+    for name in names:
+        if name not in SCENARIOS:
+            sys.exit(f"Unknown scenario {name}; choose from {', '.join(SCENARIOS)}")
+        # Fresh workers per scenario so each starts from the same state
+        workers = [Worker(i, user_id, token, product_ids, args.seed) for i, (user_id, token) in enumerate(zip(user_ids, tokens))]
+        results["endpoints"][name] = run_scenario(client, workers, SCENARIOS[name], args.requests, args.warmup)
+    
+    print_report(results, baseline)
+    
+    output = args.output or os.path.join(
+        ROOT, "benchmarks", "results",
+        f"{'in-memory' if args.in_memory else 'server'}-{datetime.utcnow():%Y%m%dT%H%M%S}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {output}")
+    
+    if baseline:
+        regressions = compare(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -4,7 +4,64 @@ from datetime import timedelta
 class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
     MONGO_URI = os.environ.get('MONGO_URI') or 'mongodb://localhost:27017/ecofinds'
+    MONGO_MAX_POOL_SIZE = int(os.environ.get('MONGO_MAX_POOL_SIZE', 100))
+    MONGO_MIN_POOL_SIZE = int(os.environ.get('MONGO_MIN_POOL_SIZE', 0))
+    MONGO_MAX_IDLE_TIME_MS = int(os.environ.get('MONGO_MAX_IDLE_TIME_MS', 60000))
+    MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.environ.get('MONGO_WAIT_QUEUE_TIMEOUT_MS', 5000))
+    MONGO_CONNECT_TIMEOUT_MS = int(os.environ.get('MONGO_CONNECT_TIMEOUT_MS', 5000))
+    MONGO_SOCKET_TIMEOUT_MS = int(os.environ.get('MONGO_SOCKET_TIMEOUT_MS', 30000))
+    MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.environ.get('MONGO_SERVER_SELECTION_TIMEOUT_MS', 5000))
+    MONGO_USE_TRANSACTIONS = os.environ.get('MONGO_USE_TRANSACTIONS', 'false').lower() == 'true'
+    MONGO_ENSURE_INDEXES = os.environ.get('MONGO_ENSURE_INDEXES', 'true').lower() == 'true'
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or 'jwt-secret-key-change-in-production'
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
+    BCRYPT_ROUNDS = int(os.environ.get('BCRYPT_ROUNDS', 12))
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 2))
+    PASSWORD_HASH_QUEUE_SIZE = int(os.environ.get('PASSWORD_HASH_QUEUE_SIZE', 32))
+    PASSWORD_HASH_TIMEOUT = int(os.environ.get('PASSWORD_HASH_TIMEOUT', 10))
+    AUTH_RATE_LIMIT_ENABLED = os.environ.get('AUTH_RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+    AUTH_RATE_LIMIT_IP_CAPACITY = int(os.environ.get('AUTH_RATE_LIMIT_IP_CAPACITY', 20))
+    AUTH_RATE_LIMIT_IP_REFILL = float(os.environ.get('AUTH_RATE_LIMIT_IP_REFILL', 0.5))
+    AUTH_RATE_LIMIT_EMAIL_CAPACITY = int(os.environ.get('AUTH_RATE_LIMIT_EMAIL_CAPACITY', 5))
+    AUTH_RATE_LIMIT_EMAIL_REFILL = float(os.environ.get('AUTH_RATE_LIMIT_EMAIL_REFILL', 0.1))
+    AUTH_RATE_LIMIT_MAX_KEYS = int(os.environ.get('AUTH_RATE_LIMIT_MAX_KEYS', 10000))
     UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'frontend/static/uploads')
-    ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
\ No newline at end of file
+    DEFAULT_PAGE_SIZE = int(os.environ.get('DEFAULT_PAGE_SIZE', 24))
+    MAX_PAGE_SIZE = int(os.environ.get('MAX_PAGE_SIZE', 100))
+    STREAM_BATCH_SIZE = int(os.environ.get('STREAM_BATCH_SIZE', 500))
+    STREAM_CHUNK_SIZE = int(os.environ.get('STREAM_CHUNK_SIZE', 64 * 1024))
+    MAX_SEARCH_LENGTH = int(os.environ.get('MAX_SEARCH_LENGTH', 100))
+    PURCHASE_SUMMARY_MONTHS = int(os.environ.get('PURCHASE_SUMMARY_MONTHS', 12))
+    PURCHASE_SUMMARY_TOP_ITEMS = int(os.environ.get('PURCHASE_SUMMARY_TOP_ITEMS', 5))
+    PURCHASE_SUMMARY_MAX_TIME_MS = int(os.environ.get('PURCHASE_SUMMARY_MAX_TIME_MS', 2000))
+    IMPORT_BATCH_SIZE = int(os.environ.get('IMPORT_BATCH_SIZE', 500))
+    IMPORT_MAX_BATCH_SIZE = int(os.environ.get('IMPORT_MAX_BATCH_SIZE', 5000))
+    IMPORT_MAX_ROWS = int(os.environ.get('IMPORT_MAX_ROWS', 50000))
+    IMPORT_MAX_ERRORS = int(os.environ.get('IMPORT_MAX_ERRORS', 1000))
+    IMPORT_MAX_BYTES = int(os.environ.get('IMPORT_MAX_BYTES', 50 * 1024 * 1024))
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() == 'true'
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+    SLOW_QUERY_LOG_ENABLED = os.environ.get('SLOW_QUERY_LOG_ENABLED', 'false').lower() == 'true'
+    SLOW_QUERY_THRESHOLD_MS = int(os.environ.get('SLOW_QUERY_THRESHOLD_MS', 100))
+    SLOW_QUERY_EXPLAIN = os.environ.get('SLOW_QUERY_EXPLAIN', 'true').lower() == 'true'
+    SLOW_QUERY_LOG_FILE = os.environ.get('SLOW_QUERY_LOG_FILE') or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'logs', 'slow_queries.log')
+    SLOW_QUERY_LOG_MAX_BYTES = int(os.environ.get('SLOW_QUERY_LOG_MAX_BYTES', 10 * 1024 * 1024))
+    SLOW_QUERY_LOG_BACKUPS = int(os.environ.get('SLOW_QUERY_LOG_BACKUPS', 5))
+    PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', 'false').lower() == 'true'
+    PROFILING_SECRET = os.environ.get('PROFILING_SECRET')
+    PROFILER = os.environ.get('PROFILER', 'cprofile')
+    PROFILE_SAMPLE_INTERVAL = float(os.environ.get('PROFILE_SAMPLE_INTERVAL', 0.001))
+    PROFILE_DIR = os.environ.get('PROFILE_DIR') or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'profiles')
+    CACHE_ENABLED = os.environ.get('CACHE_ENABLED', 'true').lower() == 'true'
+    CACHE_TTL = int(os.environ.get('CACHE_TTL', 30))
+    CACHE_MAX_ENTRIES = int(os.environ.get('CACHE_MAX_ENTRIES', 1024))
+    ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
+    MAX_IMAGE_SIZE = int(os.environ.get('MAX_IMAGE_SIZE', 10 * 1024 * 1024))
+    UPLOAD_CHUNK_SIZE = int(os.environ.get('UPLOAD_CHUNK_SIZE', 64 * 1024))
+    # App-wide request body cap; image uploads are limited to MAX_IMAGE_SIZE
+    # by the file store, imports to IMPORT_MAX_BYTES
+    MAX_CONTENT_LENGTH = int(os.environ.get('MAX_CONTENT_LENGTH', 64 * 1024 * 1024))
+    IMAGE_FORMAT = os.environ.get('IMAGE_FORMAT', 'WEBP').upper()
+    IMAGE_QUALITY = int(os.environ.get('IMAGE_QUALITY', 80))
+    IMAGE_WORKERS = int(os.environ.get('IMAGE_WORKERS', 2))
+    IMAGE_KEEP_ORIGINAL = os.environ.get('IMAGE_KEEP_ORIGINAL', 'false').lower() == 'true'
\ No newline at end of file
@@ -73,11 +73,13 @@ const API = {
     },
     
     // Product endpoints
-    getAllProducts: async (category = null, searchQuery = null) => {
+    getAllProducts: async (category = null, searchQuery = null, cursor = null, fields = null) => {
         let url = '/api/products/';
         const params = new URLSearchParams();
         if (category) params.append('category', category);
         if (searchQuery) params.append('search', searchQuery);
+        if (cursor) params.append('cursor', cursor);
+        if (fields) params.append('fields', fields);
         if (params.toString()) url += `?${params.toString()}`;
         
         const response = await fetch(url, {
@@ -139,8 +141,11 @@ const API = {
         return await response.json();
     },
     
-    getUserProducts: async () => {
-        const response = await fetch('/api/products/user', {
+    getUserProducts: async (cursor = null) => {
+        let url = '/api/products/user';
+        if (cursor) url += `?cursor=${encodeURIComponent(cursor)}`;
+        
+        const response = await fetch(url, {
             headers: {
                 'Authorization': `Bearer ${localStorage.getItem('token')}`
             }
@@ -224,8 +229,20 @@ const API = {
         return await response.json();
     },
     
-    getPurchases: async () => {
-        const response = await fetch('/api/users/purchases', {
+    getPurchases: async (cursor = null) => {
+        let url = '/api/users/purchases';
+        if (cursor) url += `?cursor=${encodeURIComponent(cursor)}`;
+        
+        const response = await fetch(url, {
+            headers: {
+                'Authorization': `Bearer ${localStorage.getItem('token')}`
+            }
+        });
+        return await response.json();
+    },
+    
+    getPurchaseSummary: async () => {
+        const response = await fetch('/api/users/purchases/summary', {
             headers: {
                 'Authorization': `Bearer ${localStorage.getItem('token')}`
             }
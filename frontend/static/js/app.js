@@ -99,6 +99,7 @@ function setupEventListeners() {
             loadProfile();
             break;
         case 'purchases':
+            loadPurchaseSummary();
             loadPurchases();
             break;
     }
@@ -190,6 +191,7 @@ function updateUIForCurrentPage() {
             loadProfile();
             break;
         case 'purchases':
+            loadPurchaseSummary();
             loadPurchases();
             break;
     }
@@ -315,20 +317,8 @@ function loadProducts() {
         const category = categoryFilter ? categoryFilter.value : null;
         const searchQuery = searchInput ? searchInput.value : null;
         
-        // Fetch products
-        API.getAllProducts(category, searchQuery)
-            .then(data => {
-                if (data.error) {
-                    showNotification(data.error, 'error');
-                    return;
-                }
-                
-                state.products = data.products;
-                renderProducts(productGrid);
-            })
-            .catch(error => {
-                showNotification('Failed to load products', 'error');
-            });
+        // Fetch first page of products
+        fetchProducts(productGrid, category, searchQuery);
     }
     
     // Setup filter event listeners
@@ -359,22 +349,50 @@ function loadProducts() {
     }
 }
 
-function renderProducts(container) {
-    // Clear container
-    container.innerHTML = '';
-    
-    if (state.products.length === 0) {
-        container.innerHTML = '<p class="text-center py-8 text-gray-500">No products found.</p>';
-        return;
+function fetchProducts(productGrid, category, searchQuery, cursor = null) {
+    // Product cards only need these fields
+    API.getAllProducts(category, searchQuery, cursor, 'title,price,category,image_url,images')
+        .then(data => {
+            if (data.error) {
+                showNotification(data.error, 'error');
+                return;
+            }
+            
+            if (cursor) {
+                state.products = state.products.concat(data.products);
+                renderProducts(productGrid, data.products, true);
+            } else {
+                state.products = data.products;
+                renderProducts(productGrid);
+            }
+            
+            renderLoadMore(productGrid, data.next_cursor, () => {
+                fetchProducts(productGrid, category, searchQuery, data.next_cursor);
+            });
+        })
+        .catch(error => {
+            showNotification('Failed to load products', 'error');
+        });
+}
+
+function renderProducts(container, products = state.products, append = false) {
+    // Clear container unless appending the next page
+    if (!append) {
+        container.innerHTML = '';
+        
+        if (products.length === 0) {
+            container.innerHTML = '<p class="text-center py-8 text-gray-500">No products found.</p>';
+            return;
+        }
     }
     
     // Create product cards
-    state.products.forEach(product => {
+    products.forEach(product => {
         const productCard = document.createElement('div');
         productCard.className = 'bg-white rounded-lg shadow overflow-hidden';
         productCard.innerHTML = `
             <div class="h-48 bg-gray-200">
-                <img src="${product.image_url || '/static/images/placeholder.jpg'}" alt="${product.title}" class="h-full w-full object-cover">
+                <img src="${(product.images && product.images.card) || product.image_url || '/static/images/placeholder.jpg'}" alt="${product.title}" class="h-full w-full object-cover" loading="lazy">
             </div>
             <div class="p-4">
                 <h3 class="text-lg font-medium text-gray-900">${product.title}</h3>
@@ -497,11 +515,11 @@ function setupAddProductListeners() {
     }
 }
 
-function loadMyListings() {
+function loadMyListings(cursor = null) {
     const listingsContainer = document.getElementById('my-listings-list');
     
     if (listingsContainer) {
-        API.getUserProducts()
+        API.getUserProducts(cursor)
             .then(data => {
                 if (data.error) {
                     showNotification(data.error, 'error');
@@ -510,12 +528,16 @@ function loadMyListings() {
                 
                 const products = data.products;
                 
-                // Clear container
-                listingsContainer.innerHTML = '';
+                renderLoadMore(listingsContainer, data.next_cursor, () => loadMyListings(data.next_cursor));
                 
-                if (products.length === 0) {
-                    listingsContainer.innerHTML = '<li class="px-4 py-8 text-center text-gray-500">You have no listings yet.</li>';
-                    return;
+                // Clear container unless appending the next page
+                if (!cursor) {
+                    listingsContainer.innerHTML = '';
+                    
+                    if (products.length === 0) {
+                        listingsContainer.innerHTML = '<li class="px-4 py-8 text-center text-gray-500">You have no listings yet.</li>';
+                        return;
+                    }
                 }
                 
                 // Create listing items
@@ -530,7 +552,7 @@ function loadMyListings() {
                         const priceEl = clone.querySelector('.listing-price');
                         const categoryEl = clone.querySelector('.listing-category');
                         
-                        if (imageEl) imageEl.src = product.image_url || '/static/images/placeholder.jpg';
+                        if (imageEl) imageEl.src = (product.images && product.images.thumbnail) || product.image_url || '/static/images/placeholder.jpg';
                         if (titleEl) titleEl.textContent = product.title;
                         if (priceEl) priceEl.textContent = `$${product.price.toFixed(2)}`;
                         if (categoryEl) categoryEl.textContent = product.category;
@@ -691,7 +713,7 @@ function loadCart() {
                         const priceEl = clone.querySelector('.cart-item-price');
                         const quantityEl = clone.querySelector('.cart-item-quantity');
                         
-                        if (imageEl) imageEl.src = item.product.image_url || '/static/images/placeholder.jpg';
+                        if (imageEl) imageEl.src = item.product.thumbnail_url || item.product.image_url || '/static/images/placeholder.jpg';
                         if (titleEl) titleEl.textContent = item.product.title;
                         if (priceEl) priceEl.textContent = `$${item.product.price.toFixed(2)}`;
                         if (quantityEl) quantityEl.textContent = item.quantity;
@@ -802,29 +824,55 @@ function loadProfile() {
     }
 }
 
-function loadPurchases() {
+// Totals come from the server-side summary, not from the loaded pages
+function loadPurchaseSummary() {
+    const summaryContainer = document.getElementById('purchase-summary');
+    
+    if (summaryContainer) {
+        API.getPurchaseSummary()
+            .then(data => {
+                if (data.error || data.summary.order_count === 0) return;
+                
+                const summary = data.summary;
+                const topCategory = summary.by_category.find(category => category.category);
+                document.getElementById('summary-total-spent').textContent = `$${summary.total_spent.toFixed(2)}`;
+                document.getElementById('summary-order-count').textContent = summary.order_count;
+                document.getElementById('summary-top-category').textContent = topCategory ? topCategory.category : '-';
+                summaryContainer.classList.remove('hidden');
+            })
+            .catch(error => {
+                console.error('Failed to load purchase summary:', error);
+            });
+    }
+}
+
+function loadPurchases(cursor = null) {
     const purchasesContainer = document.getElementById('purchases-list');
     
     if (purchasesContainer) {
-        API.getPurchases()
+        API.getPurchases(cursor)
             .then(data => {
                 if (data.error) {
                     showNotification(data.error, 'error');
                     return;
                 }
                 
-                state.purchases = data.purchases;
+                state.purchases = cursor ? state.purchases.concat(data.purchases) : data.purchases;
                 
-                // Clear container
-                purchasesContainer.innerHTML = '';
+                renderLoadMore(purchasesContainer, data.next_cursor, () => loadPurchases(data.next_cursor));
                 
-                if (state.purchases.length === 0) {
-                    purchasesContainer.innerHTML = '<div class="bg-white shadow overflow-hidden sm:rounded-lg px-4 py-8 text-center text-gray-500">You have no previous purchases.</div>';
-                    return;
+                // Clear container unless appending the next page
+                if (!cursor) {
+                    purchasesContainer.innerHTML = '';
+                    
+                    if (data.purchases.length === 0) {
+                        purchasesContainer.innerHTML = '<div class="bg-white shadow overflow-hidden sm:rounded-lg px-4 py-8 text-center text-gray-500">You have no previous purchases.</div>';
+                        return;
+                    }
                 }
                 
                 // Create purchase items
-                state.purchases.forEach(purchase => {
+                data.purchases.forEach(purchase => {
                     const template = document.getElementById('purchase-template');
                     if (template) {
                         const clone = document.importNode(template.content, true);
@@ -838,9 +886,7 @@ function loadPurchases() {
                         if (idEl) idEl.textContent = purchase._id.substring(0, 8);
                         if (dateEl) dateEl.textContent = new Date(purchase.created_at).toLocaleDateString();
                         
-                        // Calculate total
-                        const total = purchase.items.reduce((sum, item) => sum + (item.price * item.quantity), 0);
-                        if (totalEl) totalEl.textContent = `$${total.toFixed(2)}`;
+                        if (totalEl) totalEl.textContent = `$${purchase.total_amount.toFixed(2)}`;
                         
                         // Create purchase items
                         if (itemsContainer) {
@@ -873,6 +919,30 @@ function loadPurchases() {
     }
 }
 
+// Show a "Load more" button after a paginated list, or remove it on the last page
+function renderLoadMore(container, nextCursor, onClick) {
+    const buttonId = `${container.id}-load-more`;
+    let button = document.getElementById(buttonId);
+    
+    if (!nextCursor) {
+        if (button) button.remove();
+        return;
+    }
+    
+    if (!button) {
+        button = document.createElement('button');
+        button.id = buttonId;
+        button.className = 'block mx-auto mt-6 bg-green-600 hover:bg-green-700 text-white font-medium py-2 px-4 rounded-md';
+        button.textContent = 'Load more';
+        container.insertAdjacentElement('afterend', button);
+    }
+    
+    button.onclick = (e) => {
+        e.preventDefault();
+        onClick();
+    };
+}
+
 // Show notification
 function showNotification(message, type = 'info') {
     // Create notification element if it doesn't exist